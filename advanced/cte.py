@@ -1,4 +1,8 @@
 from typing import List, Dict, Any, Optional
+import hashlib
+import re
+from ..query.parser import SQLParser
+from .subqueries import _get_executor_cls
 
 class CTEExecutor:
     
@@ -7,32 +11,77 @@ class CTEExecutor:
         self.schema = schema_manager
         self.indexes = index_manager
         self.materialized_ctes = {}
+        self.parser = SQLParser()
+        self._exec = None
+        self._name_patterns: Dict[str, re.Pattern] = {}
     
     def execute_with_clause(self, ctes: List[Dict[str, Any]], main_query: str) -> List[Dict[str, Any]]:
         self.materialized_ctes.clear()
         
+        needed = self._referenced_ctes(ctes, main_query)
+        results_by_hash = {}
+        
         for cte in ctes:
             cte_name = cte['name']
+            if cte_name not in needed:
+                continue
+            
             cte_query = cte['query']
+            query_hash = hashlib.blake2b(cte_query.encode('utf-8'), digest_size=16).hexdigest()
             
-            from ..query.executor import QueryExecutor
-            executor = QueryExecutor(self.storage, self.schema, self.indexes)
-            result = executor.execute(cte_query)
+            result = results_by_hash.get(query_hash)
+            if result is None:
+                result = self._execute_bound(cte_query)
+                results_by_hash[query_hash] = result
             
             self.materialized_ctes[cte_name] = result
         
-        modified_query = self._replace_cte_references(main_query)
+        return self._execute_bound(main_query)
+    
+    def _executor(self):
+        if self._exec is None:
+            self._exec = _get_executor_cls()(self.storage, self.schema, self.indexes)
+            # materialized_ctes is cleared in place, so one binding is enough
+            self._exec.cte_data = self.materialized_ctes
+        return self._exec
+    
+    def _execute_bound(self, query: str) -> Any:
+        executor = self._executor()
         
-        from ..query.executor import QueryExecutor
-        executor = QueryExecutor(self.storage, self.schema, self.indexes)
-        executor.cte_data = self.materialized_ctes
-        return executor.execute(modified_query)
-    
-    def _replace_cte_references(self, query: str) -> str:
-        for cte_name in self.materialized_ctes.keys():
-            query = query.replace(f"FROM {cte_name}", f"FROM __CTE_{cte_name}__")
-            query = query.replace(f"JOIN {cte_name}", f"JOIN __CTE_{cte_name}__")
-        return query
+        parsed = self.parser.parse(query)
+        if parsed['type'] != 'SELECT':
+            return executor.execute(query)
+        return executor.execute_select(self._bind_cte_references(parsed))
+    
+    def _referenced_ctes(self, ctes: List[Dict[str, Any]], main_query: str) -> set:
+        # Walk the WITH list backwards: a CTE is needed if the main query or
+        # a CTE that is itself needed refers to it. Unreferenced CTEs are
+        # never executed.
+        needed = set()
+        texts = [main_query]
+        for cte in reversed(ctes):
+            cte_name = cte['name']
+            if any(self._name_pattern(cte_name).search(text) for text in texts):
+                needed.add(cte_name)
+                texts.append(cte['query'])
+        return needed
+    
+    def _name_pattern(self, cte_name: str) -> re.Pattern:
+        pattern = self._name_patterns.get(cte_name)
+        if pattern is None:
+            pattern = re.compile(rf"\b{re.escape(cte_name)}\b")
+            self._name_patterns[cte_name] = pattern
+        return pattern
+    
+    def _bind_cte_references(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        # Resolve CTE names on the parsed FROM/JOIN nodes rather than by
+        # rewriting the SQL text, so literals and column names are untouched.
+        if parsed.get('table') in self.materialized_ctes:
+            parsed['table'] = f"__CTE_{parsed['table']}__"
+        for join in parsed.get('joins') or []:
+            if join.get('table') in self.materialized_ctes:
+                join['table'] = f"__CTE_{join['table']}__"
+        return parsed
     
     def get_cte_data(self, cte_name: str) -> Optional[List[Dict[str, Any]]]:
         return self.materialized_ctes.get(cte_name)
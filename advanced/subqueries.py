@@ -1,5 +1,21 @@
 from typing import List, Dict, Any, Optional
+import re
+from collections import OrderedDict
 from ..query.parser import SQLParser
+from ..utils.exceptions import SQLSyntaxError
+
+OUTER_REFERENCE = re.compile(r"\bOUTER\.(\w+)\b")
+OUTER_TEMPLATE_CACHE_SIZE = 128
+
+_QueryExecutorCls = None
+
+def _get_executor_cls():
+    # Imported on first use to avoid a circular import with query.executor
+    global _QueryExecutorCls
+    if _QueryExecutorCls is None:
+        from ..query.executor import QueryExecutor
+        _QueryExecutorCls = QueryExecutor
+    return _QueryExecutorCls
 
 class SubqueryExecutor:
     
@@ -8,48 +24,143 @@ class SubqueryExecutor:
         self.schema = schema_manager
         self.indexes = index_manager
         self.parser = SQLParser()
+        self._exec = None
+        self._outer_templates: 'OrderedDict[str, tuple]' = OrderedDict()
+    
+    def _executor(self):
+        # QueryExecutor construction loads the catalog, so build it once and
+        # reuse it for every subquery (correlated ones run per outer row)
+        if self._exec is None:
+            self._exec = _get_executor_cls()(self.storage, self.schema, self.indexes)
+        return self._exec
     
     def execute_scalar_subquery(self, subquery_sql: str, context: Dict[str, Any]) -> Any:
-        from ..query.executor import QueryExecutor
-        executor = QueryExecutor(self.storage, self.schema, self.indexes)
+        executor = self._executor()
         result = executor.execute(subquery_sql)
         
+        return self._first_value(result)
+    
+    def _first_value(self, result: List[Any]) -> Any:
         if result and len(result) > 0:
             first_row = result[0]
             if isinstance(first_row, dict):
-                return list(first_row.values())[0]
+                return next(iter(first_row.values()))
             return first_row[0] if isinstance(first_row, (list, tuple)) else first_row
         return None
     
     def execute_exists_subquery(self, subquery_sql: str, context: Dict[str, Any]) -> bool:
-        from ..query.executor import QueryExecutor
-        executor = QueryExecutor(self.storage, self.schema, self.indexes)
+        executor = self._executor()
         result = executor.execute(subquery_sql)
         return len(result) > 0
     
     def execute_in_subquery(self, subquery_sql: str, context: Dict[str, Any]) -> List[Any]:
-        from ..query.executor import QueryExecutor
-        executor = QueryExecutor(self.storage, self.schema, self.indexes)
+        executor = self._executor()
         result = executor.execute(subquery_sql)
         
-        values = []
-        for row in result:
-            if isinstance(row, dict):
-                values.append(list(row.values())[0])
-            elif isinstance(row, (list, tuple)):
-                values.append(row[0])
-            else:
-                values.append(row)
-        return values
+        if not result:
+            return []
+        
+        # Rows share one shape, so resolve the first column once up front
+        if isinstance(result[0], dict):
+            first_key = next(iter(result[0]))
+            return [row[first_key] for row in result]
+        if isinstance(result[0], (list, tuple)):
+            return [row[0] for row in result]
+        return list(result)
     
     def execute_correlated_subquery(self, subquery_sql: str, outer_row: Dict[str, Any]) -> Any:
-        modified_sql = self._substitute_outer_references(subquery_sql, outer_row)
-        return self.execute_scalar_subquery(modified_sql, {})
-    
-    def _substitute_outer_references(self, sql: str, outer_row: Dict[str, Any]) -> str:
-        for column, value in outer_row.items():
-            if isinstance(value, str):
-                sql = sql.replace(f"OUTER.{column}", f"'{value}'")
-            else:
-                sql = sql.replace(f"OUTER.{column}", str(value))
-        return sql
+        parsed = self._substitute_outer_references(subquery_sql, outer_row)
+        executor = self._executor()
+        result = executor.execute_select(parsed)
+        
+        return self._first_value(result)
+    
+    def execute_correlated_batch(self, subquery_sql: str, outer_rows: List[Dict[str, Any]]) -> List[Any]:
+        # A single inner_col = OUTER.col correlation runs once as
+        # inner_col IN (...) over the distinct outer values; each outer row is
+        # then answered from a hash table. Anything else runs once per row.
+        plan = self._decorrelate(subquery_sql)
+        if plan is None:
+            return [self.execute_correlated_subquery(subquery_sql, row) for row in outer_rows]
+        
+        parsed, inner_column, outer_column = plan
+        outer_values = list(dict.fromkeys(
+            row[outer_column] for row in outer_rows if row.get(outer_column) is not None
+        ))
+        if not outer_values:
+            return [None] * len(outer_rows)
+        
+        parsed['where'] = {'column': inner_column, 'operator': 'IN', 'value': outer_values}
+        result = self._executor().execute_select(parsed)
+        
+        # The first row per key is the scalar result, as in the per-row path
+        result_by_key: Dict[Any, Any] = {}
+        for row in result:
+            key = row.get(inner_column)
+            if key not in result_by_key:
+                result_by_key[key] = next(iter(row.values()))
+        
+        return [result_by_key.get(row.get(outer_column)) for row in outer_rows]
+    
+    def _decorrelate(self, sql: str) -> Optional[tuple]:
+        template, outer_columns = self._outer_template(sql)
+        if len(outer_columns) != 1:
+            return None
+        
+        parsed = dict(template)
+        where = parsed.get('where')
+        if (not isinstance(where, dict) or where.get('operator') != '='
+                or where.get('value') != {'parameter': True} or 'column' not in where):
+            return None
+        
+        # Per-outer-row LIMIT/aggregation/UNION cannot be expressed by a
+        # single IN query over all keys
+        if (parsed.get('aggregates') or parsed.get('group_by') or parsed.get('limit')
+                or parsed.get('offset') or parsed.get('union')):
+            return None
+        
+        inner_column = where['column']
+        if parsed['columns'] != ['*'] and inner_column not in parsed['columns']:
+            parsed['columns'] = parsed['columns'] + [inner_column]
+        
+        return parsed, inner_column, outer_columns[0]
+    
+    def _substitute_outer_references(self, sql: str, outer_row: Dict[str, Any]) -> Dict[str, Any]:
+        # Outer values are bound on a parsed template, so they never pass
+        # through the SQL text (no quoting) and the text is scanned and
+        # parsed once per subquery rather than once per outer row
+        template, columns = self._outer_template(sql)
+        parsed = dict(template)
+        parsed['where'] = self._bind_parameters(
+            template.get('where'), iter([outer_row.get(column) for column in columns])
+        )
+        return parsed
+    
+    def _outer_template(self, sql: str) -> tuple:
+        entry = self._outer_templates.get(sql)
+        if entry is not None:
+            self._outer_templates.move_to_end(sql)
+            return entry
+        
+        columns = OUTER_REFERENCE.findall(sql)
+        template = self.parser.parse(OUTER_REFERENCE.sub('?', sql))
+        
+        remaining = iter(columns)
+        self._bind_parameters(template.get('where'), remaining)
+        if next(remaining, remaining) is not remaining:
+            raise SQLSyntaxError("OUTER references are only supported in WHERE conditions")
+        
+        entry = (template, columns)
+        self._outer_templates[sql] = entry
+        if len(self._outer_templates) > OUTER_TEMPLATE_CACHE_SIZE:
+            self._outer_templates.popitem(last=False)
+        return entry
+    
+    def _bind_parameters(self, node: Any, params) -> Any:
+        if isinstance(node, dict):
+            if node.get('parameter') is True and len(node) == 1:
+                return next(params, node)
+            return {key: self._bind_parameters(value, params) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self._bind_parameters(item, params) for item in node]
+        return node
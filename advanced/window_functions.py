@@ -1,5 +1,7 @@
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Optional
 from collections import deque
+from itertools import groupby
+import heapq
 
 class WindowFunctionExecutor:
     
@@ -19,84 +21,103 @@ class WindowFunctionExecutor:
                                 function_name: str, 
                                 partition_by: List[str],
                                 order_by: List[tuple],
-                                args: List[Any] = None) -> List[Any]:
+                                args: List[Any] = None,
+                                top_k: Optional[int] = None) -> List[Any]:
         
         if not rows:
             return []
         
-        partitions = self._partition_rows(rows, partition_by)
-        results = []
+        func = self.functions.get(function_name.upper())
+        if not func:
+            return [None] * len(rows)
         
-        for partition in partitions:
-            sorted_partition = self._sort_partition(partition, order_by)
-            func = self.functions.get(function_name.upper())
-            
-            if func:
-                partition_results = func(sorted_partition, args or [])
-                results.extend(partition_results)
+        # Pull the ORDER BY values out column by column once; partitions and
+        # sorts then work on row indices instead of rebuilding tuples per row
+        order_keys = self._column_keys(rows, [col for col, _ in order_by]) if order_by else None
+        results = [None] * len(rows)
+        
+        # ROW_NUMBER() ... WHERE rn <= K only needs the first K rows of each
+        # partition; rows outside the top K are left as None
+        use_top_k = top_k is not None and function_name.upper() == 'ROW_NUMBER'
+        
+        for indices in self._partition_rows(rows, partition_by):
+            if use_top_k:
+                indices = self._top_k_partition(indices, order_keys, order_by, top_k)
             else:
-                results.extend([None] * len(sorted_partition))
+                indices = self._sort_partition(indices, order_keys, order_by)
+            partition = [rows[i] for i in indices]
+            keys = [order_keys[i] for i in indices] if order_keys else [()] * len(indices)
+            
+            for i, value in zip(indices, func(partition, keys, args or [])):
+                results[i] = value
         
         return results
     
-    def _partition_rows(self, rows: List[Dict[str, Any]], partition_by: List[str]) -> List[List[Dict[str, Any]]]:
+    def _column_keys(self, rows: List[Dict[str, Any]], columns: List[str]) -> List[tuple]:
+        return list(zip(*[[row.get(col) for row in rows] for col in columns]))
+    
+    def _partition_rows(self, rows: List[Dict[str, Any]], partition_by: List[str]) -> List[List[int]]:
         if not partition_by:
-            return [rows]
+            return [list(range(len(rows)))]
         
         partitions = {}
-        for row in rows:
-            key = tuple(row.get(col) for col in partition_by)
-            if key not in partitions:
-                partitions[key] = []
-            partitions[key].append(row)
+        for i, key in enumerate(self._column_keys(rows, partition_by)):
+            bucket = partitions.get(key)
+            if bucket is None:
+                partitions[key] = [i]
+            else:
+                bucket.append(i)
         
         return list(partitions.values())
     
-    def _sort_partition(self, partition: List[Dict[str, Any]], order_by: List[tuple]) -> List[Dict[str, Any]]:
+    def _sort_partition(self, indices: List[int], order_keys: List[tuple], 
+                        order_by: List[tuple]) -> List[int]:
         if not order_by:
-            return partition
-        
-        def sort_key(row):
-            return tuple(row.get(col) for col, _ in order_by)
-        
-        reverse = any(direction == 'DESC' for _, direction in order_by)
-        return sorted(partition, key=sort_key, reverse=reverse)
+            return indices
+        
+        directions = [direction == 'DESC' for _, direction in order_by]
+        if all(directions) or not any(directions):
+            return sorted(indices, key=order_keys.__getitem__, reverse=directions[0])
+        
+        # Mixed ASC/DESC: sort is stable (also with reverse=True), so one pass
+        # per column from least to most significant gives the combined order
+        for position in range(len(order_by) - 1, -1, -1):
+            indices = sorted(indices, key=lambda i: order_keys[i][position],
+                             reverse=directions[position])
+        return indices
     
-    def _row_number(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[int]:
+    def _top_k_partition(self, indices: List[int], order_keys: List[tuple], 
+                         order_by: List[tuple], k: int) -> List[int]:
+        if not order_by:
+            return indices[:k]
+        
+        directions = {direction == 'DESC' for _, direction in order_by}
+        if directions == {True}:
+            return heapq.nlargest(k, indices, key=order_keys.__getitem__)
+        if directions == {False}:
+            return heapq.nsmallest(k, indices, key=order_keys.__getitem__)
+        return self._sort_partition(indices, order_keys, order_by)[:k]
+    
+    def _row_number(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[int]:
         return list(range(1, len(partition) + 1))
     
-    def _rank(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[int]:
+    def _rank(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[int]:
+        # Emit one run per group of equal keys instead of comparing row by row
         ranks = []
-        current_rank = 1
-        prev_value = None
-        
-        for i, row in enumerate(partition):
-            current_value = tuple(row.values())
-            if prev_value is not None and current_value != prev_value:
-                current_rank = i + 1
-            ranks.append(current_rank)
-            prev_value = current_value
-        
+        for _, peers in groupby(keys):
+            ranks.extend([len(ranks) + 1] * len(list(peers)))
         return ranks
     
-    def _dense_rank(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[int]:
+    def _dense_rank(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[int]:
         ranks = []
-        current_rank = 1
-        prev_value = None
-        
-        for row in partition:
-            current_value = tuple(row.values())
-            if prev_value is not None and current_value != prev_value:
-                current_rank += 1
-            ranks.append(current_rank)
-            prev_value = current_value
-        
+        for rank, (_, peers) in enumerate(groupby(keys), 1):
+            ranks.extend([rank] * len(list(peers)))
         return ranks
     
-    def _lag(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[Any]:
+    def _lag(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[Any]:
         offset = args[0] if args else 1
         default = args[1] if len(args) > 1 else None
-        column = args[2] if len(args) > 2 else list(partition[0].keys())[0]
+        column = args[2] if len(args) > 2 else next(iter(partition[0]))
         
         results = []
         for i in range(len(partition)):
@@ -107,10 +128,10 @@ class WindowFunctionExecutor:
         
         return results
     
-    def _lead(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[Any]:
+    def _lead(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[Any]:
         offset = args[0] if args else 1
         default = args[1] if len(args) > 1 else None
-        column = args[2] if len(args) > 2 else list(partition[0].keys())[0]
+        column = args[2] if len(args) > 2 else next(iter(partition[0]))
         
         results = []
         for i in range(len(partition)):
@@ -121,40 +142,28 @@ class WindowFunctionExecutor:
         
         return results
     
-    def _first_value(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[Any]:
+    def _first_value(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[Any]:
         if not partition:
             return []
         
-        column = args[0] if args else list(partition[0].keys())[0]
+        column = args[0] if args else next(iter(partition[0]))
         first_val = partition[0].get(column)
         return [first_val] * len(partition)
     
-    def _last_value(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[Any]:
+    def _last_value(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[Any]:
         if not partition:
             return []
         
-        column = args[0] if args else list(partition[0].keys())[0]
+        column = args[0] if args else next(iter(partition[0]))
         last_val = partition[-1].get(column)
         return [last_val] * len(partition)
     
-    def _ntile(self, partition: List[Dict[str, Any]], args: List[Any]) -> List[int]:
+    def _ntile(self, partition: List[Dict[str, Any]], keys: List[tuple], args: List[Any]) -> List[int]:
         n = args[0] if args else 4
-        partition_size = len(partition)
-        bucket_size = partition_size // n
-        remainder = partition_size % n
+        bucket_size, remainder = divmod(len(partition), n)
         
         results = []
-        current_bucket = 1
-        count_in_bucket = 0
-        bucket_limit = bucket_size + (1 if current_bucket <= remainder else 0)
-        
-        for _ in partition:
-            results.append(current_bucket)
-            count_in_bucket += 1
-            
-            if count_in_bucket >= bucket_limit and current_bucket < n:
-                current_bucket += 1
-                count_in_bucket = 0
-                bucket_limit = bucket_size + (1 if current_bucket <= remainder else 0)
+        for bucket in range(1, n + 1):
+            results.extend([bucket] * (bucket_size + (1 if bucket <= remainder else 0)))
         
         return results
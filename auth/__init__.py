@@ -2,8 +2,8 @@
 Authentication and Authorization Module
 """
 
-from .user_manager import UserManager, User
+from .user_manager import UserManager, AsyncUserManager, User
 from .authenticator import Authenticator
 from .authorizer import Authorizer
 
-__all__ = ['UserManager', 'User', 'Authenticator', 'Authorizer']
+__all__ = ['UserManager', 'AsyncUserManager', 'User', 'Authenticator', 'Authorizer']
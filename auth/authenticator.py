@@ -30,7 +30,4 @@ class Authenticator:
         if not user:
             return False
         
-        # Hash provided password with user's salt
-        password_hash, _ = self.user_manager.hash_password(password, user.salt)
-        
-        return password_hash == user.password_hash
+        return self.user_manager.verify_password(password, user.password_hash, user.salt)
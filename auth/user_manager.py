@@ -2,12 +2,25 @@
 User Management System for RibbitXDB
 """
 
+import asyncio
 import hashlib
+import hmac
 import secrets
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 import ribbitxdb
 
+# scrypt cost parameters (16 MiB per hash)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Authorization results are cached per (user, database, table, permission)
+PERMISSION_CACHE_SIZE = 1024
+PERMISSION_CACHE_TTL = 60  # seconds
+
 class User:
     """Database user"""
     def __init__(self, user_id: int, username: str, password_hash: bytes, 
@@ -24,58 +37,73 @@ class UserManager:
     
     def __init__(self, database_path: str):
         self.database_path = database_path
+        self._lock = threading.RLock()
+        self._permission_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._conn = ribbitxdb.connect(database_path)
         self._init_system_tables()
         self._create_default_admin()
     
+    def close(self):
+        """Close the shared database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
     def _init_system_tables(self):
         """Initialize system tables for user management"""
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        # Users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS _users (
-                user_id INTEGER PRIMARY KEY,
-                username TEXT UNIQUE NOT NULL,
-                password_hash BLOB NOT NULL,
-                salt BLOB NOT NULL,
-                created_at INTEGER NOT NULL,
-                is_superuser INTEGER DEFAULT 0
-            )
-        """)
-        
-        # Roles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS _roles (
-                role_id INTEGER PRIMARY KEY,
-                role_name TEXT UNIQUE NOT NULL,
-                description TEXT
-            )
-        """)
-        
-        # User roles mapping
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS _user_roles (
-                user_id INTEGER,
-                role_id INTEGER,
-                PRIMARY KEY (user_id, role_id)
-            )
-        """)
-        
-        # Permissions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS _permissions (
-                permission_id INTEGER PRIMARY KEY,
-                user_id INTEGER,
-                database_name TEXT,
-                table_name TEXT,
-                permission_type TEXT NOT NULL,
-                granted_at INTEGER NOT NULL
-            )
-        """)
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        conn.commit()
-        conn.close()
+            # Users table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS _users (
+                    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password_hash BLOB NOT NULL,
+                    salt BLOB NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    is_superuser INTEGER DEFAULT 0
+                )
+            """)
+        
+            # Roles table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS _roles (
+                    role_id INTEGER PRIMARY KEY,
+                    role_name TEXT UNIQUE NOT NULL,
+                    description TEXT
+                )
+            """)
+        
+            # User roles mapping
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS _user_roles (
+                    user_id INTEGER,
+                    role_id INTEGER,
+                    PRIMARY KEY (user_id, role_id)
+                )
+            """)
+        
+            # Permissions table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS _permissions (
+                    permission_id INTEGER PRIMARY KEY,
+                    user_id INTEGER,
+                    database_name TEXT,
+                    table_name TEXT,
+                    permission_type TEXT NOT NULL,
+                    granted_at INTEGER NOT NULL
+                )
+            """)
+        
+            self._conn.commit()
     
     def _create_default_admin(self):
         """Create default admin user if not exists"""
@@ -83,17 +111,24 @@ class UserManager:
             self.create_user('admin', 'admin123', is_superuser=True)
     
     def hash_password(self, password: str, salt: Optional[bytes] = None) -> tuple:
-        """Hash password with BLAKE2 and salt"""
+        """Hash password with scrypt and salt"""
         if salt is None:
-            salt = secrets.token_bytes(32)
+            salt = secrets.token_bytes(16)
         
-        # Use BLAKE2b for password hashing
-        hasher = hashlib.blake2b(salt=salt, digest_size=32)
-        hasher.update(password.encode('utf-8'))
-        password_hash = hasher.digest()
+        # scrypt is a memory-hard KDF, so each guess costs SCRYPT_N * SCRYPT_R
+        # * 128 bytes of memory instead of a single hash block
+        password_hash = hashlib.scrypt(
+            password.encode('utf-8'), salt=salt,
+            n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=32
+        )
         
         return password_hash, salt
     
+    def verify_password(self, password: str, password_hash: bytes, salt: bytes) -> bool:
+        """Check a password against a stored hash in constant time"""
+        candidate, _ = self.hash_password(password, salt)
+        return hmac.compare_digest(candidate, password_hash)
+    
     def create_user(self, username: str, password: str, 
                     is_superuser: bool = False) -> int:
         """Create new user"""
@@ -103,21 +138,16 @@ class UserManager:
         password_hash, salt = self.hash_password(password)
         created_at = int(time.time())
         
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        # Get next user ID
-        cursor.execute("SELECT MAX(user_id) FROM _users")
-        result = cursor.fetchone()
-        user_id = (result[0] or 0) + 1 if result else 1
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO _users (user_id, username, password_hash, salt, created_at, is_superuser)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (user_id, username, password_hash, salt, created_at, 1 if is_superuser else 0))
+            cursor.execute("""
+                INSERT INTO _users (username, password_hash, salt, created_at, is_superuser)
+                VALUES (?, ?, ?, ?, ?)
+            """, (username, password_hash, salt, created_at, 1 if is_superuser else 0))
+            user_id = cursor.lastrowid
         
-        conn.commit()
-        conn.close()
+            self._conn.commit()
         
         return user_id
     
@@ -126,40 +156,38 @@ class UserManager:
         if username == 'admin':
             raise ValueError("Cannot drop admin user")
         
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("DELETE FROM _users WHERE username = ?", (username,))
-        deleted = cursor.rowcount > 0
+            cursor.execute("DELETE FROM _users WHERE username = ?", (username,))
+            deleted = cursor.rowcount > 0
         
-        conn.commit()
-        conn.close()
+            self._conn.commit()
+            self._permission_cache.clear()
         
         return deleted
     
     def user_exists(self, username: str) -> bool:
         """Check if user exists"""
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("SELECT 1 FROM _users WHERE username = ?", (username,))
-        exists = cursor.fetchone() is not None
+            cursor.execute("SELECT 1 FROM _users WHERE username = ?", (username,))
+            exists = cursor.fetchone() is not None
         
-        conn.close()
         return exists
     
     def get_user(self, username: str) -> Optional[User]:
         """Get user by username"""
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("""
-            SELECT user_id, username, password_hash, salt, created_at, is_superuser
-            FROM _users WHERE username = ?
-        """, (username,))
+            cursor.execute("""
+                SELECT user_id, username, password_hash, salt, created_at, is_superuser
+                FROM _users WHERE username = ?
+            """, (username,))
         
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
         
         if row:
             return User(
@@ -174,17 +202,16 @@ class UserManager:
     
     def list_users(self) -> List[Dict[str, Any]]:
         """List all users"""
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("""
-            SELECT user_id, username, created_at, is_superuser
-            FROM _users
-            ORDER BY username
-        """)
+            cursor.execute("""
+                SELECT user_id, username, created_at, is_superuser
+                FROM _users
+                ORDER BY username
+            """)
         
-        users = cursor.fetchall()
-        conn.close()
+            users = cursor.fetchall()
         
         return users
     
@@ -196,17 +223,16 @@ class UserManager:
         
         password_hash, salt = self.hash_password(new_password)
         
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("""
-            UPDATE _users 
-            SET password_hash = ?, salt = ?
-            WHERE username = ?
-        """, (password_hash, salt, username))
+            cursor.execute("""
+                UPDATE _users 
+                SET password_hash = ?, salt = ?
+                WHERE username = ?
+            """, (password_hash, salt, username))
         
-        conn.commit()
-        conn.close()
+            self._conn.commit()
         
         return True
     
@@ -217,16 +243,16 @@ class UserManager:
         if not user:
             raise ValueError(f"User '{username}' does not exist")
         
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO _permissions (user_id, database_name, table_name, permission_type, granted_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user.user_id, database_name, table_name, permission_type, int(time.time())))
+            cursor.execute("""
+                INSERT INTO _permissions (user_id, database_name, table_name, permission_type, granted_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (user.user_id, database_name, table_name, permission_type, int(time.time())))
         
-        conn.commit()
-        conn.close()
+            self._conn.commit()
+            self._permission_cache.clear()
     
     def revoke_permission(self, username: str, database_name: str,
                          table_name: str, permission_type: str):
@@ -235,46 +261,118 @@ class UserManager:
         if not user:
             raise ValueError(f"User '{username}' does not exist")
         
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
         
-        cursor.execute("""
-            DELETE FROM _permissions
-            WHERE user_id = ? AND database_name = ? AND table_name = ? AND permission_type = ?
-        """, (user.user_id, database_name, table_name, permission_type))
+            cursor.execute("""
+                DELETE FROM _permissions
+                WHERE user_id = ? AND database_name = ? AND table_name = ? AND permission_type = ?
+            """, (user.user_id, database_name, table_name, permission_type))
         
-        conn.commit()
-        conn.close()
+            self._conn.commit()
+            self._permission_cache.clear()
     
     def check_permission(self, username: str, database_name: str,
                         table_name: str, permission_type: str) -> bool:
         """Check if user has permission"""
-        user = self.get_user(username)
-        if not user:
-            return False
-        
-        # Superuser has all permissions
-        if user.is_superuser:
-            return True
-        
-        conn = ribbitxdb.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        # Check exact permission
-        cursor.execute("""
-            SELECT 1 FROM _permissions
-            WHERE user_id = ? AND database_name = ? AND table_name = ? AND permission_type = ?
-        """, (user.user_id, database_name, table_name, permission_type))
-        
-        has_perm = cursor.fetchone() is not None
-        
-        # Check wildcard permissions
-        if not has_perm:
+        cache_key = (username, database_name, table_name, permission_type)
+        
+        with self._lock:
+            entry = self._permission_cache.get(cache_key)
+            if entry is not None and time.time() - entry[1] < PERMISSION_CACHE_TTL:
+                self._permission_cache.move_to_end(cache_key)
+                return entry[0]
+            
+            cursor = self._conn.cursor()
+            
+            # One round trip: the user row joined with all of its grants
             cursor.execute("""
-                SELECT 1 FROM _permissions
-                WHERE user_id = ? AND database_name = ? AND table_name = '*' AND permission_type = ?
-            """, (user.user_id, database_name, permission_type))
-            has_perm = cursor.fetchone() is not None
+                SELECT is_superuser, database_name, table_name, permission_type
+                FROM _users LEFT JOIN _permissions ON user_id = user_id
+                WHERE username = ?
+            """, (username,))
+            
+            has_perm = False
+            for is_superuser, perm_database, perm_table, perm_type in cursor.fetchall():
+                # Superuser has all permissions
+                if is_superuser:
+                    has_perm = True
+                    break
+                # Exact or wildcard table permission
+                if (perm_database == database_name and perm_type == permission_type
+                        and perm_table in (table_name, '*')):
+                    has_perm = True
+                    break
+            
+            self._permission_cache[cache_key] = (has_perm, time.time())
+            if len(self._permission_cache) > PERMISSION_CACHE_SIZE:
+                self._permission_cache.popitem(last=False)
         
-        conn.close()
         return has_perm
+
+class AsyncUserManager:
+    """Run UserManager calls in an executor so auth does not block the loop"""
+    
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self._manager: Optional[UserManager] = None
+    
+    async def __aenter__(self):
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def connect(self):
+        # One shared UserManager rather than a pool: separate connections to
+        # the same file do not see each other's writes
+        loop = asyncio.get_running_loop()
+        self._manager = await loop.run_in_executor(None, UserManager, self.database_path)
+        return self
+    
+    async def close(self):
+        if self._manager:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._manager.close)
+            self._manager = None
+    
+    async def _run(self, method, *args):
+        if not self._manager:
+            raise RuntimeError("UserManager not connected. Call connect() first.")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, method, *args)
+    
+    async def create_user(self, username: str, password: str,
+                          is_superuser: bool = False) -> int:
+        return await self._run(self._manager.create_user, username, password, is_superuser)
+    
+    async def drop_user(self, username: str) -> bool:
+        return await self._run(self._manager.drop_user, username)
+    
+    async def user_exists(self, username: str) -> bool:
+        return await self._run(self._manager.user_exists, username)
+    
+    async def get_user(self, username: str) -> Optional[User]:
+        return await self._run(self._manager.get_user, username)
+    
+    async def list_users(self) -> List[Dict[str, Any]]:
+        return await self._run(self._manager.list_users)
+    
+    async def change_password(self, username: str, new_password: str) -> bool:
+        return await self._run(self._manager.change_password, username, new_password)
+    
+    async def grant_permission(self, username: str, database_name: str,
+                               table_name: str, permission_type: str):
+        return await self._run(self._manager.grant_permission, username,
+                               database_name, table_name, permission_type)
+    
+    async def revoke_permission(self, username: str, database_name: str,
+                                table_name: str, permission_type: str):
+        return await self._run(self._manager.revoke_permission, username,
+                               database_name, table_name, permission_type)
+    
+    async def check_permission(self, username: str, database_name: str,
+                               table_name: str, permission_type: str) -> bool:
+        return await self._run(self._manager.check_permission, username,
+                               database_name, table_name, permission_type)
@@ -1,4 +1,25 @@
 from typing import List, Dict, Any, Optional
+from functools import lru_cache
+
+# Statements only depend on the table and column signature, so each one is
+# built once and shared by every chunk, bucket and BatchOperations instance
+
+@lru_cache(maxsize=512)
+def _build_insert_sql(table: str, columns: tuple) -> str:
+    placeholders = ', '.join(['?' for _ in columns])
+    column_names = ', '.join(columns)
+    return f"INSERT INTO {table} ({column_names}) VALUES ({placeholders})"
+
+@lru_cache(maxsize=256)
+def _build_update_sql(table: str, columns: tuple, key_columns: tuple) -> str:
+    set_clauses = ', '.join([f"{col} = ?" for col in columns])
+    where_clauses = ' AND '.join([f"{col} = ?" for col in key_columns])
+    return f"UPDATE {table} SET {set_clauses} WHERE {where_clauses}"
+
+@lru_cache(maxsize=256)
+def _build_delete_sql(table: str, key_columns: tuple) -> str:
+    where_clauses = ' AND '.join([f"{col} = ?" for col in key_columns])
+    return f"DELETE FROM {table} WHERE {where_clauses}"
 
 class BatchOperations:
     
@@ -11,22 +32,26 @@ class BatchOperations:
         if not rows:
             return 0
         
-        columns = list(rows[0].keys())
-        placeholders = ', '.join(['?' for _ in columns])
-        column_names = ', '.join(columns)
-        
-        sql = f"INSERT INTO {table} ({column_names}) VALUES ({placeholders})"
-        
         total_inserted = 0
-        for i in range(0, len(rows), chunk_size):
-            chunk = rows[i:i + chunk_size]
-            
-            for row in chunk:
-                values = [row[col] for col in columns]
-                self.cursor.execute(sql, tuple(values))
-                total_inserted += 1
+        self.connection.execute("BEGIN")
+        try:
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i:i + chunk_size]
+                
+                # Rows may carry different column sets (e.g. JSON-derived
+                # data); bucket them so each signature gets its own statement
+                buckets: Dict[tuple, List[tuple]] = {}
+                for row in chunk:
+                    buckets.setdefault(tuple(row.keys()), []).append(tuple(row.values()))
+                
+                for columns, params in buckets.items():
+                    self.cursor.executemany(_build_insert_sql(table, columns), params)
+                    total_inserted += len(params)
             
             self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
         
         return total_inserted
     
@@ -36,21 +61,29 @@ class BatchOperations:
             return 0
         
         total_updated = 0
-        for i in range(0, len(updates), chunk_size):
-            chunk = updates[i:i + chunk_size]
-            
-            for update in chunk:
-                key_value = update.pop(key_column)
-                set_clauses = ', '.join([f"{col} = ?" for col in update.keys()])
-                values = list(update.values()) + [key_value]
+        self.connection.execute("BEGIN")
+        try:
+            for i in range(0, len(updates), chunk_size):
+                chunk = updates[i:i + chunk_size]
                 
-                sql = f"UPDATE {table} SET {set_clauses} WHERE {key_column} = ?"
-                self.cursor.execute(sql, tuple(values))
-                total_updated += self.cursor.rowcount
+                # Bucket rows by the set of columns they touch so each bucket
+                # shares one UPDATE statement
+                buckets: Dict[tuple, List[tuple]] = {}
+                for update in chunk:
+                    # Read the key in place; the caller's dict is never mutated
+                    signature = tuple(col for col in update if col != key_column)
+                    values = tuple(update[col] for col in signature) + (update[key_column],)
+                    buckets.setdefault(signature, []).append(values)
                 
-                update[key_column] = key_value
+                for signature, params in buckets.items():
+                    sql = _build_update_sql(table, signature, (key_column,))
+                    self.cursor.executemany(sql, params)
+                    total_updated += self.cursor.rowcount
             
             self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
         
         return total_updated
     
@@ -60,56 +93,70 @@ class BatchOperations:
             return 0
         
         total_deleted = 0
-        for i in range(0, len(conditions), chunk_size):
-            chunk = conditions[i:i + chunk_size]
-            
-            for condition in chunk:
-                where_clauses = ' AND '.join([f"{col} = ?" for col in condition.keys()])
-                values = list(condition.values())
+        self.connection.execute("BEGIN")
+        try:
+            for i in range(0, len(conditions), chunk_size):
+                chunk = conditions[i:i + chunk_size]
+                
+                buckets: Dict[tuple, List[tuple]] = {}
+                for condition in chunk:
+                    buckets.setdefault(tuple(condition.keys()), []).append(tuple(condition.values()))
                 
-                sql = f"DELETE FROM {table} WHERE {where_clauses}"
-                self.cursor.execute(sql, tuple(values))
-                total_deleted += self.cursor.rowcount
+                for signature, params in buckets.items():
+                    sql = _build_delete_sql(table, signature)
+                    self.cursor.executemany(sql, params)
+                    total_deleted += self.cursor.rowcount
             
             self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
         
         return total_deleted
     
     def bulk_upsert(self, table: str, rows: List[Dict[str, Any]], 
                    key_columns: List[str], chunk_size: int = 1000) -> Dict[str, int]:
         stats = {'inserted': 0, 'updated': 0}
+        key_columns = tuple(key_columns)
+        key_names = ', '.join(key_columns)
         
         for i in range(0, len(rows), chunk_size):
             chunk = rows[i:i + chunk_size]
             
+            # Preload the keys that already exist with a single probe instead
+            # of one COUNT(*) per row. The IN list filters on the leading key
+            # column; full composite keys are matched in memory.
+            lead_values = tuple({row[key_columns[0]] for row in chunk})
+            placeholders = ', '.join(['?' for _ in lead_values])
+            check_sql = f"SELECT {key_names} FROM {table} WHERE {key_columns[0]} IN ({placeholders})"
+            self.cursor.execute(check_sql, lead_values)
+            existing = set(self.cursor.fetchall())
+            
+            to_insert: Dict[tuple, List[tuple]] = {}
+            to_update: Dict[tuple, List[tuple]] = {}
             for row in chunk:
-                key_conditions = {col: row[col] for col in key_columns}
-                where_clauses = ' AND '.join([f"{col} = ?" for col in key_columns])
-                key_values = [row[col] for col in key_columns]
-                
-                check_sql = f"SELECT COUNT(*) FROM {table} WHERE {where_clauses}"
-                self.cursor.execute(check_sql, tuple(key_values))
-                exists = self.cursor.fetchone()['count_*'] > 0
+                key_values = tuple(row[col] for col in key_columns)
                 
-                if exists:
-                    update_cols = [col for col in row.keys() if col not in key_columns]
+                if key_values in existing:
+                    update_cols = tuple(col for col in row.keys() if col not in key_columns)
                     if update_cols:
-                        set_clauses = ', '.join([f"{col} = ?" for col in update_cols])
-                        update_values = [row[col] for col in update_cols] + key_values
-                        
-                        sql = f"UPDATE {table} SET {set_clauses} WHERE {where_clauses}"
-                        self.cursor.execute(sql, tuple(update_values))
+                        params = tuple(row[col] for col in update_cols) + key_values
+                        to_update.setdefault(update_cols, []).append(params)
                         stats['updated'] += 1
                 else:
-                    columns = list(row.keys())
-                    placeholders = ', '.join(['?' for _ in columns])
-                    column_names = ', '.join(columns)
-                    values = [row[col] for col in columns]
-                    
-                    sql = f"INSERT INTO {table} ({column_names}) VALUES ({placeholders})"
-                    self.cursor.execute(sql, tuple(values))
+                    columns = tuple(row.keys())
+                    to_insert.setdefault(columns, []).append(tuple(row.values()))
+                    existing.add(key_values)
                     stats['inserted'] += 1
             
+            for columns, params in to_insert.items():
+                sql = _build_insert_sql(table, columns)
+                self.cursor.executemany(sql, params)
+            
+            for update_cols, params in to_update.items():
+                sql = _build_update_sql(table, update_cols, key_columns)
+                self.cursor.executemany(sql, params)
+            
             self.connection.commit()
         
         return stats
@@ -1,6 +1,77 @@
+import re
+from decimal import Decimal
+from numbers import Real
+from functools import lru_cache
+from itertools import islice
 from typing import Any, List, Optional, Tuple
+from operator import itemgetter
 from .utils.exceptions import ProgrammingError
 
+def _render_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+def _render_blob(value) -> str:
+    return "X'" + bytes(value).hex() + "'"
+
+def _render_bool(value) -> str:
+    return 'TRUE' if value else 'FALSE'
+
+def _render_other(value: Any) -> str:
+    # Subclasses miss the exact-type table; bool is checked before int as
+    # it is one. Numbers render as numbers, only strings and the unknown
+    # are quoted
+    if isinstance(value, bool):
+        return _render_bool(value)
+    if isinstance(value, int):
+        return str(int(value))
+    if isinstance(value, (Real, Decimal)):
+        return repr(float(value))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _render_blob(value)
+    return _render_string(str(value))
+
+# SQL literal rendering for bound parameters, keyed by exact type; anything
+# else goes through _render_other
+_LITERAL_RENDERERS = {
+    str: _render_string,
+    int: str,
+    float: repr,
+    bool: _render_bool,
+    type(None): lambda value: 'NULL',
+    bytes: _render_blob,
+    bytearray: _render_blob,
+    memoryview: _render_blob,
+}
+
+# A quoted run (a doubled quote is two adjacent runs) or a placeholder,
+# captured as group 1; a '?' inside a literal is not a placeholder
+_PLACEHOLDER_RE = re.compile(r"""'[^']*'|"[^"]*"|(\?)""")
+
+def _split_placeholders(sql: str) -> List[str]:
+    """Split a statement around its parameter placeholders"""
+    if "'" not in sql and '"' not in sql:
+        return sql.split('?')
+    parts = []
+    start = 0
+    for match in _PLACEHOLDER_RE.finditer(sql):
+        if match.group(1):
+            parts.append(sql[start:match.start()])
+            start = match.end()
+    parts.append(sql[start:])
+    return parts
+
+# INSERT ... VALUES (...) with a single row template, captured as group 1
+_INSERT_RE = re.compile(r'^\s*INSERT\s+INTO\s+.*VALUES\s*(\([^)]*\))\s*;?\s*$', re.I | re.S)
+
+# Rows folded into one multi-row INSERT by executemany
+EXECUTEMANY_BATCH_SIZE = 500
+
+@lru_cache(maxsize=256)
+def _describe(keys: Tuple[str, ...]):
+    # Repeated queries share one description and projector per column layout
+    description = tuple((col, None, None, None, None, None, None) for col in keys)
+    return description, Cursor._make_projector(keys)
+
 class Cursor:
     def __init__(self, connection):
         self.connection = connection
@@ -9,6 +80,7 @@ class Cursor:
         self.description = None
         self._results: List[Any] = []
         self._result_index = 0
+        self._projector = None
         self.lastrowid = None
     
     def execute(self, sql: str, parameters: tuple = None) -> 'Cursor':
@@ -20,23 +92,28 @@ class Cursor:
         
         try:
             result = self.connection.executor.execute(sql)
+            self.lastrowid = self.connection.executor.last_insert_rowid
             
             if isinstance(result, list):
                 self._results = result
                 self.rowcount = len(result)
                 
+                # Decided once here so the fetch paths skip per-row isinstance
+                self._projector = None
                 if result and isinstance(result[0], dict):
-                    self.description = [(col, None, None, None, None, None, None) 
-                                       for col in result[0].keys()]
+                    self.description, self._projector = _describe(tuple(result[0]))
             elif isinstance(result, bool):
                 self.rowcount = 1 if result else 0
                 self._results = []
+                self._projector = None
             elif isinstance(result, int):
                 self.rowcount = result
                 self._results = []
+                self._projector = None
             else:
                 self.rowcount = -1
                 self._results = []
+                self._projector = None
             
             self._result_index = 0
             
@@ -49,6 +126,11 @@ class Cursor:
         if self.connection.is_closed:
             raise ProgrammingError("Cannot execute on closed connection")
         
+        match = _INSERT_RE.match(sql)
+        if match:
+            return self._executemany_insert(sql[:match.start(1)], match.group(1),
+                                            seq_of_parameters)
+        
         total_rows = 0
         for parameters in seq_of_parameters:
             self.execute(sql, parameters)
@@ -58,6 +140,34 @@ class Cursor:
         self.rowcount = total_rows
         return self
     
+    def _executemany_insert(self, prefix: str, row_template: str,
+                            seq_of_parameters) -> 'Cursor':
+        # Parse and dispatch once per batch instead of once per row
+        placeholders = len(_split_placeholders(row_template)) - 1
+        rows = iter(seq_of_parameters)
+        total_rows = 0
+        
+        while True:
+            batch = list(islice(rows, EXECUTEMANY_BATCH_SIZE))
+            if not batch:
+                break
+            
+            flat = []
+            for parameters in batch:
+                if len(parameters) != placeholders:
+                    raise ProgrammingError(
+                        f"Incorrect number of bindings supplied: statement uses "
+                        f"{placeholders}, {len(parameters)} supplied"
+                    )
+                flat.extend(parameters)
+            
+            self.execute(prefix + ', '.join([row_template] * len(batch)), flat)
+            if self.rowcount > 0:
+                total_rows += self.rowcount
+        
+        self.rowcount = total_rows
+        return self
+    
     def fetchone(self) -> Optional[Tuple]:
         if self._result_index >= len(self._results):
             return None
@@ -65,36 +175,60 @@ class Cursor:
         result = self._results[self._result_index]
         self._result_index += 1
         
-        if isinstance(result, dict):
-            return tuple(result.values())
+        if self._projector is not None:
+            return self._convert_rows([result])[0]
         return result
     
     def fetchmany(self, size: int = None) -> List[Tuple]:
         if size is None:
             size = self.arraysize
         
-        results = []
-        for _ in range(size):
-            row = self.fetchone()
-            if row is None:
-                break
-            results.append(row)
-        
-        return results
+        start = self._result_index
+        end = min(start + size, len(self._results))
+        self._result_index = max(end, start)
+        return self._convert_rows(self._results[start:end])
     
     def fetchall(self) -> List[Tuple]:
-        results = []
-        while True:
-            row = self.fetchone()
-            if row is None:
-                break
-            results.append(row)
-        
-        return results
+        start = self._result_index
+        self._result_index = len(self._results)
+        return self._convert_rows(self._results[start:])
+    
+    def _convert_rows(self, rows: List[Any]) -> List[Tuple]:
+        if self._projector is None:
+            return rows
+        try:
+            return list(map(self._projector, rows))
+        except KeyError:
+            pass
+        # Rows keyed differently but as wide as the description are read by
+        # position; rows missing a column (e.g. unmatched LEFT JOIN rows)
+        # read it as NULL
+        projector = self._projector
+        keys = [col[0] for col in self.description]
+        converted = []
+        for row in rows:
+            try:
+                converted.append(projector(row))
+            except KeyError:
+                if len(row) == len(keys):
+                    converted.append(tuple(row.values()))
+                else:
+                    converted.append(tuple(row.get(key) for key in keys))
+        return converted
+    
+    @staticmethod
+    def _make_projector(keys: Tuple[str, ...]):
+        # itemgetter builds the row tuple in C, in description order
+        if len(keys) > 1:
+            return itemgetter(*keys)
+        if keys:
+            return lambda row, key=keys[0]: (row[key],)
+        return lambda row: ()
     
     def close(self):
         self._results = []
         self._result_index = 0
+        self._projector = None
         self.description = None
         self.rowcount = -1
     
@@ -102,19 +236,21 @@ class Cursor:
         if not parameters:
             return sql
         
-        result = sql
-        for i, param in enumerate(parameters):
-            placeholder = '?'
-            if isinstance(param, str):
-                value = f"'{param}'"
-            elif param is None:
-                value = 'NULL'
-            else:
-                value = str(param)
-            
-            result = result.replace(placeholder, value, 1)
+        # One split and one join instead of a full-string replace per value
+        parts = _split_placeholders(sql)
+        if len(parts) - 1 != len(parameters):
+            raise ProgrammingError(
+                f"Incorrect number of bindings supplied: statement uses "
+                f"{len(parts) - 1}, {len(parameters)} supplied"
+            )
         
-        return result
+        result = [parts[0]]
+        for param, part in zip(parameters, parts[1:]):
+            render = _LITERAL_RENDERERS.get(type(param), _render_other)
+            result.append(render(param))
+            result.append(part)
+        
+        return ''.join(result)
     
     def __iter__(self):
         return self
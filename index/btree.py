@@ -1,23 +1,85 @@
 from typing import Any, Optional, List, Tuple
 from collections import OrderedDict
+from bisect import bisect_left, bisect_right
+from array import array
 import pickle
+import struct
+import sys
+
+FLAT_MAGIC = b'RBT1'
+_FLAT_HEADER = struct.Struct('<4sII')   # magic, order, node count
+_FLAT_NODE = struct.Struct('<BII')      # is_leaf, key count, child count
+_FLAT_COLUMN = struct.Struct('<cI')     # encoding tag, payload length
+# Integer columns use the narrowest signed width that fits; tags are the
+# width in bytes so the format does not depend on the platform's C int size
+_INT_TYPECODES = {array(code).itemsize: code for code in 'qlihb'}
+_INT_WIDTHS = [width for width in (1, 2, 4, 8) if width in _INT_TYPECODES]
+_COLUMN_TYPECODES = {str(width).encode(): _INT_TYPECODES[width] for width in _INT_WIDTHS}
+_COLUMN_TYPECODES[b'd'] = 'd'
+
+def _pack_column(items: List[Any]) -> bytes:
+    # Homogeneous int/float columns are stored as raw little-endian arrays;
+    # anything else falls back to pickle
+    tag, payload = b'p', None
+    if all(item is None for item in items):
+        tag, payload = b'n', b''
+    elif all(type(item) is int for item in items):
+        low, high = min(items), max(items)
+        for width in _INT_WIDTHS:
+            limit = 1 << (width * 8 - 1)
+            if -limit <= low and high < limit:
+                tag = str(width).encode()
+                payload = _array_bytes(array(_INT_TYPECODES[width], items))
+                break
+    elif all(type(item) is float for item in items):
+        tag, payload = b'd', _array_bytes(array('d', items))
+    
+    if payload is None:
+        payload = pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+    return _FLAT_COLUMN.pack(tag, len(payload)) + payload
+
+def _array_bytes(arr: array) -> bytes:
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr.tobytes()
+
+def _unpack_column(data: memoryview, offset: int, count: int) -> Tuple[List[Any], int]:
+    tag, length = _FLAT_COLUMN.unpack_from(data, offset)
+    offset += _FLAT_COLUMN.size
+    payload = data[offset:offset + length]
+    
+    if tag == b'n':
+        items = [None] * count
+    elif tag in _COLUMN_TYPECODES:
+        arr = array(_COLUMN_TYPECODES[tag])
+        arr.frombytes(payload)
+        if sys.byteorder == 'big':
+            arr.byteswap()
+        items = arr.tolist()
+    else:
+        items = pickle.loads(payload)
+    
+    return items, offset + length
 
 class LRUCache:
     """Least Recently Used cache for page caching"""
+    __slots__ = ('cache', 'capacity')
+    
     def __init__(self, capacity: int = 1000):
         self.cache = OrderedDict()
         self.capacity = capacity
     
     def get(self, key: Any) -> Optional[Any]:
-        if key not in self.cache:
+        # move_to_end doubles as the membership test on a hit
+        try:
+            self.cache.move_to_end(key)
+        except KeyError:
             return None
-        self.cache.move_to_end(key)
         return self.cache[key]
     
     def put(self, key: Any, value: Any):
-        if key in self.cache:
-            self.cache.move_to_end(key)
         self.cache[key] = value
+        self.cache.move_to_end(key)
         if len(self.cache) > self.capacity:
             self.cache.popitem(last=False)
     
@@ -27,36 +89,47 @@ class LRUCache:
     def size(self) -> int:
         return len(self.cache)
 
+def _make_keys(key_typecode: Optional[str], keys=()) -> Any:
+    # Typed trees keep keys in an array.array (8 bytes per int/float instead
+    # of a PyObject pointer plus the object); bisect and insert work unchanged
+    if key_typecode:
+        return array(key_typecode, keys)
+    return list(keys)
+
 class BTreeNode:
-    def __init__(self, order: int, is_leaf: bool = True):
+    # Trees hold thousands of nodes; slots drop the per-node __dict__
+    __slots__ = ('order', 'is_leaf', 'key_typecode', 'keys', 'values', 'children')
+    
+    def __init__(self, order: int, is_leaf: bool = True, key_typecode: Optional[str] = None):
         self.order = order
         self.is_leaf = is_leaf
-        self.keys: List[Any] = []
+        self.key_typecode = key_typecode
+        self.keys: List[Any] = _make_keys(key_typecode)
         self.values: List[Any] = []
         self.children: List['BTreeNode'] = []
     
+    def __setstate__(self, state):
+        # Slotted pickles carry (None, slots); nodes pickled before __slots__
+        # carry a plain attribute dict
+        if isinstance(state, tuple):
+            state = state[1]
+        # Nodes pickled before key arrays existed hold their keys in a list
+        self.key_typecode = None
+        for name, value in state.items():
+            setattr(self, name, value)
+    
     def is_full(self) -> bool:
         return len(self.keys) >= self.order - 1
     
     def insert_non_full(self, key: Any, value: Any):
-        i = len(self.keys) - 1
+        # bisect_right keeps equal keys in insertion order; list.insert does
+        # the shift in one C memmove
+        i = bisect_right(self.keys, key)
         
         if self.is_leaf:
-            self.keys.append(None)
-            self.values.append(None)
-            
-            while i >= 0 and key < self.keys[i]:
-                self.keys[i + 1] = self.keys[i]
-                self.values[i + 1] = self.values[i]
-                i -= 1
-            
-            self.keys[i + 1] = key
-            self.values[i + 1] = value
+            self.keys.insert(i, key)
+            self.values.insert(i, value)
         else:
-            while i >= 0 and key < self.keys[i]:
-                i -= 1
-            i += 1
-            
             if self.children[i].is_full():
                 self.split_child(i)
                 if key > self.keys[i]:
@@ -67,70 +140,45 @@ class BTreeNode:
     def split_child(self, index: int):
         order = self.order
         child = self.children[index]
-        new_child = BTreeNode(order, child.is_leaf)
+        new_child = BTreeNode(order, child.is_leaf, child.key_typecode)
         
         mid = order // 2
         
-        new_child.keys = child.keys[mid:]
-        child.keys = child.keys[:mid]
-        
         if child.is_leaf:
+            new_child.keys = child.keys[mid:]
             new_child.values = child.values[mid:]
+            child.keys = child.keys[:mid]
             child.values = child.values[:mid]
+            separator = child.keys[-1] if child.keys else None
         else:
-            new_child.children = child.children[mid:]
-            child.children = child.children[:mid]
+            # Separators are the largest key of the subtree to their left, so
+            # the middle key moves up and each half keeps len(keys) + 1 children
+            separator = child.keys[mid]
+            new_child.keys = child.keys[mid + 1:]
+            new_child.values = child.values[mid + 1:]
+            new_child.children = child.children[mid + 1:]
+            child.keys = child.keys[:mid]
+            child.values = child.values[:mid]
+            child.children = child.children[:mid + 1]
         
-        self.keys.insert(index, child.keys[-1] if child.keys else None)
+        self.keys.insert(index, separator)
         self.values.insert(index, None)
         self.children.insert(index + 1, new_child)
     
-    def search(self, key: Any) -> Optional[Any]:
-        # Binary search for better performance
-        left, right = 0, len(self.keys) - 1
-        i = -1
-        
-        while left <= right:
-            mid = (left + right) // 2
-            if self.keys[mid] == key:
-                i = mid
-                break
-            elif self.keys[mid] < key:
-                left = mid + 1
-            else:
-                right = mid - 1
-        
-        if i >= 0 and i < len(self.keys) and key == self.keys[i]:
-            return self.values[i] if self.is_leaf else None
-        
+    def range_search(self, start_key: Any, end_key: Any) -> List[Tuple[Any, Any]]:
         if self.is_leaf:
-            return None
+            lo = bisect_left(self.keys, start_key)
+            hi = bisect_right(self.keys, end_key)
+            return list(zip(self.keys[lo:hi], self.values[lo:hi]))
         
-        # Find correct child
-        i = 0
-        while i < len(self.keys) and key > self.keys[i]:
-            i += 1
-        
-        return self.children[i].search(key)
-    
-    def range_search(self, start_key: Any, end_key: Any) -> List[Tuple[Any, Any]]:
+        # Separators only bound the children; the entries live in the leaves
         results = []
-        
-        i = 0
-        while i < len(self.keys) and start_key > self.keys[i]:
-            i += 1
-        
-        if not self.is_leaf:
-            if i < len(self.children):
-                results.extend(self.children[i].range_search(start_key, end_key))
-        
-        while i < len(self.keys) and self.keys[i] <= end_key:
-            if self.keys[i] >= start_key:
-                results.append((self.keys[i], self.values[i]))
+        i = bisect_left(self.keys, start_key)
+        while i < len(self.children):
+            results.extend(self.children[i].range_search(start_key, end_key))
+            if i < len(self.keys) and self.keys[i] > end_key:
+                break
             i += 1
-            
-            if not self.is_leaf and i < len(self.children):
-                results.extend(self.children[i].range_search(start_key, end_key))
         
         return results
     
@@ -142,7 +190,7 @@ class BTreeNode:
         items.sort(key=lambda x: x[0])
         
         if self.is_leaf:
-            self.keys = [item[0] for item in items]
+            self.keys = _make_keys(self.key_typecode, [item[0] for item in items])
             self.values = [item[1] for item in items]
         else:
             # For internal nodes, distribute items among children
@@ -150,25 +198,25 @@ class BTreeNode:
             for i in range(0, len(items), chunk_size):
                 chunk = items[i:i + chunk_size]
                 if chunk:
-                    child = BTreeNode(self.order, is_leaf=True)
+                    child = BTreeNode(self.order, is_leaf=True, key_typecode=self.key_typecode)
                     child.bulk_load(chunk)
                     self.children.append(child)
                     if chunk:
                         self.keys.append(chunk[-1][0])
 
 class BTree:
-    def __init__(self, order: int = 256):  # Increased order for better performance
+    def __init__(self, order: int = 256,  # Increased order for better performance
+                 key_typecode: Optional[str] = None):
         self.order = order
-        self.root = BTreeNode(order)
-        self.cache = LRUCache(capacity=500)  # Cache for frequently accessed nodes
-        self._stats = {'searches': 0, 'inserts': 0, 'cache_hits': 0}
+        self.key_typecode = key_typecode
+        self.root = BTreeNode(order, key_typecode=key_typecode)
+        self._stats = {'searches': 0, 'inserts': 0}
     
     def insert(self, key: Any, value: Any):
         self._stats['inserts'] += 1
-        self.cache.clear()  # Invalidate cache on insert
         
         if self.root.is_full():
-            new_root = BTreeNode(self.order, is_leaf=False)
+            new_root = BTreeNode(self.order, is_leaf=False, key_typecode=self.key_typecode)
             new_root.children.append(self.root)
             new_root.split_child(0)
             self.root = new_root
@@ -178,20 +226,35 @@ class BTree:
     def search(self, key: Any) -> Optional[Any]:
         self._stats['searches'] += 1
         
-        # Check cache first
-        cache_key = f"search_{key}"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
-            self._stats['cache_hits'] += 1
-            return cached
+        # Iterative descent; bisect_left finds the first separator >= key,
+        # which is the child whose subtree can contain key
+        node = self.root
+        while not node.is_leaf:
+            node = node.children[bisect_left(node.keys, key)]
         
-        result = self.root.search(key)
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            return node.values[i]
+        return None
+    
+    def search_many(self, keys: List[Any]) -> List[Optional[Any]]:
+        """Look up many keys at once, in the order given"""
+        self._stats['searches'] += len(keys)
         
-        # Cache the result
-        if result is not None:
-            self.cache.put(cache_key, result)
+        # Probe in sorted order and stay in the current leaf while the key is
+        # within its range, so runs of nearby keys share one descent
+        found = {}
+        leaf = None
+        for key in sorted(set(keys)):
+            if leaf is None or not leaf.keys or key > leaf.keys[-1]:
+                leaf = self.root
+                while not leaf.is_leaf:
+                    leaf = leaf.children[bisect_left(leaf.keys, key)]
+            
+            i = bisect_left(leaf.keys, key)
+            found[key] = leaf.values[i] if i < len(leaf.keys) and leaf.keys[i] == key else None
         
-        return result
+        return [found[key] for key in keys]
     
     def range_search(self, start_key: Any, end_key: Any) -> List[Tuple[Any, Any]]:
         return self.root.range_search(start_key, end_key)
@@ -199,32 +262,107 @@ class BTree:
     def bulk_insert(self, items: List[Tuple[Any, Any]]):
         """Optimized bulk insert operation"""
         self._stats['inserts'] += len(items)
-        self.cache.clear()
         
         # Sort items first
         items.sort(key=lambda x: x[0])
         
-        # Use bulk load for better performance
-        self.root = BTreeNode(self.order)
+        # Build tree bottom-up for sorted data: fill leaves left to right,
+        # then stack internal levels until a single root remains
+        level = []
+        for chunk in self._even_chunks(items, self.order - 1):
+            leaf = BTreeNode(self.order, is_leaf=True, key_typecode=self.key_typecode)
+            leaf.keys = _make_keys(self.key_typecode, [key for key, _ in chunk])
+            leaf.values = [value for _, value in chunk]
+            level.append((leaf, leaf.keys[-1]))
         
-        # Build tree bottom-up for sorted data
-        for key, value in items:
-            self.insert(key, value)
+        if not level:
+            self.root = BTreeNode(self.order, key_typecode=self.key_typecode)
+            return
+        
+        while len(level) > 1:
+            parents = []
+            for group in self._even_chunks(level, self.order):
+                parent = BTreeNode(self.order, is_leaf=False, key_typecode=self.key_typecode)
+                parent.children = [child for child, _ in group]
+                # Separators are the largest key of each child but the last
+                parent.keys = _make_keys(self.key_typecode, [max_key for _, max_key in group[:-1]])
+                parent.values = [None] * len(parent.keys)
+                parents.append((parent, group[-1][1]))
+            level = parents
+        
+        self.root = level[0][0]
+    
+    @staticmethod
+    def _even_chunks(seq: List[Any], max_size: int) -> List[List[Any]]:
+        # Near-equal pieces, so the last node is never left nearly empty
+        if not seq:
+            return []
+        count = -(-len(seq) // max_size)
+        size, extra = divmod(len(seq), count)
+        chunks = []
+        start = 0
+        for i in range(count):
+            end = start + size + (1 if i < extra else 0)
+            chunks.append(seq[start:end])
+            start = end
+        return chunks
     
     def get_stats(self) -> dict:
         """Get performance statistics"""
-        stats = self._stats.copy()
-        if stats['searches'] > 0:
-            stats['cache_hit_rate'] = stats['cache_hits'] / stats['searches']
-        else:
-            stats['cache_hit_rate'] = 0.0
-        return stats
+        return self._stats.copy()
     
     def serialize(self) -> bytes:
         return pickle.dumps(self.root)
     
     @classmethod
-    def deserialize(cls, data: bytes, order: int = 256) -> 'BTree':
-        tree = cls(order)
+    def deserialize(cls, data: bytes, order: int = 256,
+                    key_typecode: Optional[str] = None) -> 'BTree':
+        tree = cls(order, key_typecode)
         tree.root = pickle.loads(data)
         return tree
+    
+    def serialize_flat(self) -> bytes:
+        """Serialize nodes breadth-first into a compact, pickle-free layout"""
+        nodes = [self.root]
+        for node in nodes:
+            if not node.is_leaf:
+                nodes.extend(node.children)
+        
+        parts = [_FLAT_HEADER.pack(FLAT_MAGIC, self.order, len(nodes))]
+        for node in nodes:
+            child_count = 0 if node.is_leaf else len(node.children)
+            parts.append(_FLAT_NODE.pack(node.is_leaf, len(node.keys), child_count))
+            parts.append(_pack_column(node.keys))
+            parts.append(_pack_column(node.values))
+        return b''.join(parts)
+    
+    @classmethod
+    def deserialize_flat(cls, data: bytes, key_typecode: Optional[str] = None) -> 'BTree':
+        view = memoryview(data)
+        magic, order, node_count = _FLAT_HEADER.unpack_from(view, 0)
+        if magic != FLAT_MAGIC:
+            raise ValueError("Not a flat-serialized B-tree")
+        offset = _FLAT_HEADER.size
+        
+        nodes = []
+        child_counts = []
+        for _ in range(node_count):
+            is_leaf, key_count, child_count = _FLAT_NODE.unpack_from(view, offset)
+            offset += _FLAT_NODE.size
+            
+            node = BTreeNode(order, bool(is_leaf), key_typecode)
+            keys, offset = _unpack_column(view, offset, key_count)
+            node.keys = _make_keys(key_typecode, keys)
+            node.values, offset = _unpack_column(view, offset, key_count)
+            nodes.append(node)
+            child_counts.append(child_count)
+        
+        # Children of each node follow contiguously in breadth-first order
+        next_child = 1
+        for node, child_count in zip(nodes, child_counts):
+            node.children = nodes[next_child:next_child + child_count]
+            next_child += child_count
+        
+        tree = cls(order, key_typecode)
+        tree.root = nodes[0]
+        return tree
@@ -6,10 +6,11 @@ class IndexManager:
     def __init__(self):
         self.indexes: Dict[str, BTree] = {}
     
-    def create_index(self, index_name: str, order: int = BTREE_ORDER) -> bool:
+    def create_index(self, index_name: str, order: int = BTREE_ORDER,
+                     key_typecode: Optional[str] = None) -> bool:
         if index_name in self.indexes:
             return False
-        self.indexes[index_name] = BTree(order)
+        self.indexes[index_name] = BTree(order, key_typecode)
         return True
     
     def drop_index(self, index_name: str) -> bool:
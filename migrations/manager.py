@@ -5,7 +5,12 @@ from datetime import datetime
 from ..schema.system_tables import SystemTables
 from ..utils.exceptions import MigrationError
 
+_UP_RE = re.compile(r'-- UP\s*\n(.*?)(?:-- DOWN|$)', re.DOTALL)
+_DOWN_RE = re.compile(r'-- DOWN\s*\n(.*?)$', re.DOTALL)
+
 class Migration:
+    __slots__ = ('name', 'up_sql', 'down_sql', 'applied_at')
+    
     def __init__(self, name: str, up_sql: str, down_sql: str = None):
         self.name = name
         self.up_sql = up_sql
@@ -19,6 +24,8 @@ class MigrationManager:
     def __init__(self, connection):
         self.connection = connection
         self.migrations_dir = None
+        self._migrations_cache: Optional[List[Migration]] = None
+        self._cache_key: Optional[tuple] = None
         self._ensure_migrations_table()
     
     def _ensure_migrations_table(self):
@@ -32,6 +39,7 @@ class MigrationManager:
         if not os.path.exists(directory):
             raise MigrationError(f"Migrations directory does not exist: {directory}")
         self.migrations_dir = directory
+        self._migrations_cache = None
     
     def create_migration(self, name: str, up_sql: str, down_sql: str = None) -> str:
         if not self.migrations_dir:
@@ -52,6 +60,7 @@ class MigrationManager:
         
         with open(filepath, 'w') as f:
             f.write(content)
+        self._migrations_cache = None
         
         return filepath
     
@@ -59,18 +68,31 @@ class MigrationManager:
         if not self.migrations_dir:
             raise MigrationError("Migrations directory not set")
         
+        # One directory pass stats every file, so an added, removed, renamed
+        # or edited migration changes the key; otherwise the parsed list is
+        # reused without reading any file
+        files = []
+        with os.scandir(self.migrations_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.sql'):
+                    info = entry.stat()
+                    files.append((entry.name, info.st_mtime_ns, info.st_size))
+        files.sort()
+        key = tuple(files)
+        if self._migrations_cache is not None and key == self._cache_key:
+            return list(self._migrations_cache)
+        
         migrations = []
         
-        for filename in sorted(os.listdir(self.migrations_dir)):
-            if not filename.endswith('.sql'):
-                continue
-            
+        for filename, _, _ in files:
             filepath = os.path.join(self.migrations_dir, filename)
             migration = self._parse_migration_file(filepath, filename)
             if migration:
                 migrations.append(migration)
         
-        return migrations
+        self._migrations_cache = migrations
+        self._cache_key = key
+        return list(migrations)
     
     def _parse_migration_file(self, filepath: str, filename: str) -> Optional[Migration]:
         with open(filepath, 'r') as f:
@@ -78,8 +100,8 @@ class MigrationManager:
         
         name = filename.replace('.sql', '')
         
-        up_match = re.search(r'-- UP\s*\n(.*?)(?:-- DOWN|$)', content, re.DOTALL)
-        down_match = re.search(r'-- DOWN\s*\n(.*?)$', content, re.DOTALL)
+        up_match = _UP_RE.search(content)
+        down_match = _DOWN_RE.search(content)
         
         up_sql = up_match.group(1).strip() if up_match else None
         down_sql = down_match.group(1).strip() if down_match else None
@@ -91,8 +113,7 @@ class MigrationManager:
     
     def get_pending_migrations(self) -> List[Migration]:
         all_migrations = self.load_migrations()
-        applied = self.get_applied_migrations()
-        applied_names = {m['name'] for m in applied}
+        applied_names = self._applied_names()
         
         return [m for m in all_migrations if m.name not in applied_names]
     
@@ -103,6 +124,9 @@ class MigrationManager:
         # id=0, name=1, applied_at=2
         return [{'name': row[1], 'applied_at': row[2]} for row in rows]
     
+    def _applied_names(self) -> set:
+        return {m['name'] for m in self.get_applied_migrations()}
+    
     def up(self, migration_name: Optional[str] = None) -> List[str]:
         applied = []
         
@@ -111,7 +135,7 @@ class MigrationManager:
             if not migration:
                 raise MigrationError(f"Migration not found: {migration_name}")
             
-            if self._is_applied(migration.name):
+            if migration.name in self._applied_names():
                 raise MigrationError(f"Migration already applied: {migration_name}")
             
             self._apply_migration(migration)
@@ -132,7 +156,7 @@ class MigrationManager:
             if not migration:
                 raise MigrationError(f"Migration not found: {migration_name}")
             
-            if not self._is_applied(migration.name):
+            if migration.name not in self._applied_names():
                 raise MigrationError(f"Migration not applied: {migration_name}")
             
             self._rollback_migration(migration)
@@ -140,12 +164,13 @@ class MigrationManager:
         else:
             applied = self.get_applied_migrations()
             applied.reverse()
+            migrations = self.load_migrations()
             
             for i, applied_migration in enumerate(applied):
                 if i >= steps:
                     break
                 
-                migration = self._find_migration(applied_migration['name'])
+                migration = self._find_migration(applied_migration['name'], migrations)
                 if migration:
                     self._rollback_migration(migration)
                     rolled_back.append(migration.name)
@@ -154,27 +179,22 @@ class MigrationManager:
     
     def status(self) -> Dict[str, List[str]]:
         all_migrations = self.load_migrations()
-        applied = self.get_applied_migrations()
-        applied_names = {m['name'] for m in applied}
+        applied_names = self._applied_names()
         
         return {
             'applied': [m.name for m in all_migrations if m.name in applied_names],
             'pending': [m.name for m in all_migrations if m.name not in applied_names]
         }
     
-    def _find_migration(self, name: str) -> Optional[Migration]:
-        migrations = self.load_migrations()
+    def _find_migration(self, name: str, 
+                        migrations: Optional[List[Migration]] = None) -> Optional[Migration]:
+        if migrations is None:
+            migrations = self.load_migrations()
         for migration in migrations:
             if migration.name == name:
                 return migration
         return None
     
-    def _is_applied(self, name: str) -> bool:
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT COUNT(*) as count FROM __ribbit_migrations WHERE name = ?", (name,))
-        result = cursor.fetchone()
-        return result[0] > 0
-    
     def _apply_migration(self, migration: Migration):
         cursor = self.connection.cursor()
         
@@ -1,9 +1,20 @@
 import threading
 import time
-import queue
+from collections import deque
 from typing import Optional, Dict, Any
 from ..connection import Connection
 
+# Idle connections are reaped from release_connection at most this often
+CLEANUP_INTERVAL = 60  # seconds
+
+class _Entry:
+    """An idle connection and when it was last returned to the pool"""
+    __slots__ = ('conn', 'last_used')
+    
+    def __init__(self, conn: Connection, last_used: float):
+        self.conn = conn
+        self.last_used = last_used
+
 class ConnectionPool:
     
     def __init__(self, database: str, min_connections: int = 5, 
@@ -15,122 +26,112 @@ class ConnectionPool:
         self.timeout = timeout
         self.max_idle_time = max_idle_time
         
-        self._pool = queue.Queue(maxsize=max_connections)
+        # Idle connections as _Entry objects, oldest at the left
+        self._pool = deque()
         self._active_connections = 0
-        self._lock = threading.Lock()
-        self._connection_times = {}
+        # One condition guards both the deque and the counter, so every
+        # acquire, release and create is a single critical section
+        self._cv = threading.Condition()
+        self._last_cleanup = time.monotonic()
         
         self._initialize_pool()
-        self._start_cleanup_thread()
     
     def _initialize_pool(self):
-        for _ in range(self.min_connections):
-            conn = self._create_connection()
-            self._pool.put(conn)
+        with self._cv:
+            self._active_connections += self.min_connections
+        
+        conns = [self._create_connection() for _ in range(self.min_connections)]
+        
+        now = time.monotonic()
+        with self._cv:
+            self._pool.extend(_Entry(conn, now) for conn in conns)
+            self._cv.notify(len(conns))
     
     def _create_connection(self) -> Connection:
+        # The slot in _active_connections is already reserved by the caller
         import ribbitxdb
-        conn = ribbitxdb.connect(self.database)
-        conn_id = id(conn)
-        self._connection_times[conn_id] = time.time()
-        
-        with self._lock:
-            self._active_connections += 1
-        
+        try:
+            conn = ribbitxdb.connect(self.database)
+        except Exception:
+            with self._cv:
+                self._active_connections -= 1
+                self._cv.notify()
+            raise
         return conn
     
     def get_connection(self, timeout: Optional[int] = None) -> Connection:
         timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
         
-        try:
-            conn = self._pool.get(timeout=timeout)
-            self._connection_times[id(conn)] = time.time()
-            return conn
-        except queue.Empty:
-            with self._lock:
-                if self._active_connections < self.max_connections:
-                    return self._create_connection()
+        with self._cv:
+            while not self._pool and self._active_connections >= self.max_connections:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Could not acquire connection within {timeout} seconds")
+                self._cv.wait(remaining)
             
-            raise TimeoutError(f"Could not acquire connection within {timeout} seconds")
+            if self._pool:
+                return self._pool.popleft().conn
+            
+            self._active_connections += 1
+        
+        return self._create_connection()
     
     def release_connection(self, conn: Connection):
         if conn is None:
             return
         
-        conn_id = id(conn)
-        self._connection_times[conn_id] = time.time()
-        
-        try:
-            self._pool.put_nowait(conn)
-        except queue.Full:
-            conn.close()
-            with self._lock:
+        now = time.monotonic()
+        with self._cv:
+            pooled = len(self._pool) < self.max_connections
+            if pooled:
+                self._pool.append(_Entry(conn, now))
+                self._cv.notify()
+            else:
                 self._active_connections -= 1
-            if conn_id in self._connection_times:
-                del self._connection_times[conn_id]
-    
-    def _start_cleanup_thread(self):
-        def cleanup():
-            while True:
-                time.sleep(60)
-                self._cleanup_idle_connections()
+            
+            # Cleanup rides on release traffic instead of a polling thread
+            cleanup_due = now - self._last_cleanup >= CLEANUP_INTERVAL
+            if cleanup_due:
+                self._last_cleanup = now
         
-        thread = threading.Thread(target=cleanup, daemon=True)
-        thread.start()
+        if not pooled:
+            conn.close()
+        if cleanup_due:
+            self._cleanup_idle_connections()
     
     def _cleanup_idle_connections(self):
-        current_time = time.time()
+        cutoff = time.monotonic() - self.max_idle_time
         connections_to_close = []
         
-        temp_conns = []
-        while not self._pool.empty():
-            try:
-                conn = self._pool.get_nowait()
-                conn_id = id(conn)
-                
-                if conn_id in self._connection_times:
-                    idle_time = current_time - self._connection_times[conn_id]
-                    
-                    if idle_time > self.max_idle_time and self._active_connections > self.min_connections:
-                        connections_to_close.append(conn)
-                    else:
-                        temp_conns.append(conn)
-                else:
-                    temp_conns.append(conn)
-            except queue.Empty:
-                break
-        
-        for conn in temp_conns:
-            self._pool.put(conn)
+        # Releases append on the right, so expired connections are always a
+        # prefix of the deque and the scan stops at the first fresh one
+        with self._cv:
+            while (self._pool and self._pool[0].last_used < cutoff
+                   and self._active_connections > self.min_connections):
+                connections_to_close.append(self._pool.popleft().conn)
+                self._active_connections -= 1
         
         for conn in connections_to_close:
             conn.close()
-            conn_id = id(conn)
-            if conn_id in self._connection_times:
-                del self._connection_times[conn_id]
-            
-            with self._lock:
-                self._active_connections -= 1
     
     def close_all(self):
-        while not self._pool.empty():
-            try:
-                conn = self._pool.get_nowait()
-                conn.close()
-            except queue.Empty:
-                break
-        
-        self._connection_times.clear()
-        with self._lock:
+        with self._cv:
+            connections = [entry.conn for entry in self._pool]
+            self._pool.clear()
             self._active_connections = 0
+        
+        for conn in connections:
+            conn.close()
     
     def get_stats(self) -> Dict[str, Any]:
-        return {
-            'active_connections': self._active_connections,
-            'pool_size': self._pool.qsize(),
-            'max_connections': self.max_connections,
-            'min_connections': self.min_connections
-        }
+        with self._cv:
+            return {
+                'active_connections': self._active_connections,
+                'pool_size': len(self._pool),
+                'max_connections': self.max_connections,
+                'min_connections': self.min_connections
+            }
     
     def __enter__(self):
         return self
@@ -3,8 +3,11 @@ import re
 import pickle
 import struct
 import json
+from collections import OrderedDict
 from datetime import datetime
-from functools import reduce
+from functools import lru_cache, partial, reduce
+from itertools import chain, compress, islice, repeat
+from operator import itemgetter, methodcaller, eq, ne, lt, gt, le, ge, is_, is_not
 
 from .parser import SQLParser
 from ..schema.metadata import SchemaManager, Table, Column
@@ -21,6 +24,280 @@ from ..utils.exceptions import (
     TransactionError, UnsupportedFeatureError
 )
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Parsed DML is cached per statement shape, i.e. the SQL with its literals
+# lifted out, so "WHERE id = 1" and "WHERE id = 2" share one parse; any
+# statement without literals is cached by its exact text
+PLAN_CACHE_SIZE = 512
+
+# Compiled WHERE filters, cached per clause shape with literals as slots
+PREDICATE_CACHE_SIZE = 256
+
+_PARAMETERIZED_TYPES = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+# Blob literals stay part of the shape; quoted strings and numbers are lifted
+_LITERAL_RE = re.compile(
+    r"(?<!\w)[xX]'[^']*'"
+    r"|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\""
+    r"|(?<![\w.])-?\d[\d.]*"
+)
+
+# Numeric stand-ins parsed in place of lifted literals; far outside any
+# value a statement would spell out
+_SENTINEL_BASE = 7340032000000
+
+# High bit of a record's size word marks it deleted; pages are far smaller
+# than 2 GiB, so older files never have it set
+_TOMBSTONE = 0x80000000
+_SIZE_MASK = 0x7FFFFFFF
+_SIZE_WORD = struct.Struct('<I')
+
+# Declared column type names; anything else is stored as TEXT
+_TYPE_MAP = {
+    'INTEGER': DataType.INTEGER, 'INT': DataType.INTEGER,
+    'REAL': DataType.REAL, 'FLOAT': DataType.REAL, 'DOUBLE': DataType.REAL,
+    'TEXT': DataType.TEXT, 'VARCHAR': DataType.TEXT, 'STRING': DataType.TEXT, 'JSON': DataType.TEXT,
+    'BLOB': DataType.BLOB,
+}
+
+# Relative per-row cost of a comparison, for ordering AND terms
+_PREDICATE_COST = {
+    '=': 0, '!=': 0, 'IS': 0, 'IS NOT': 0,
+    '<': 1, '>': 1, '<=': 1, '>=': 1,
+    'IN': 2, 'BETWEEN': 2,
+    'LIKE': 3,
+}
+_UNKNOWN_COST = 4
+
+def _condition_cost(condition) -> int:
+    if not isinstance(condition, dict):
+        return 0
+    if 'column' in condition:
+        return _PREDICATE_COST.get(condition['operator'], _UNKNOWN_COST)
+    if condition.get('type') != 'COMPOUND' and 'operator' in condition:
+        return _PREDICATE_COST.get(condition['operator'].upper(), _UNKNOWN_COST)
+    return _UNKNOWN_COST
+
+def _shape_cost(shape) -> int:
+    return _PREDICATE_COST.get(shape[2], _UNKNOWN_COST) if shape[0] == 'CMP' else _UNKNOWN_COST
+
+def _and_groups(terms, operators):
+    """Split a flat condition list into OR'ed groups of AND'ed terms"""
+    groups = [list(terms[:1])]
+    for op, term in zip(operators, terms[1:]):
+        if op == 'OR':
+            groups.append([term])
+        else:
+            groups[-1].append(term)
+    return groups
+
+def _and_chain(condition) -> list:
+    # The operands of nested AST AND nodes, flattened
+    if isinstance(condition, dict) and 'column' not in condition \
+            and str(condition.get('operator', '')).upper() == 'AND':
+        return _and_chain(condition['left']) + _and_chain(condition['right'])
+    return [condition]
+
+def _both(first, second):
+    return lambda row: first(row) and second(row)
+
+def _either(first, second):
+    return lambda row: first(row) or second(row)
+
+# Predicates for conditions settled at compile time, which AND/OR fold away
+def _always(row):
+    return True
+
+def _never(row):
+    return False
+
+def _all_of(predicates: list):
+    if _never in predicates:
+        return _never
+    predicates = [p for p in predicates if p is not _always]
+    return reduce(_both, predicates) if predicates else _always
+
+def _any_of(predicates: list):
+    if _always in predicates:
+        return _always
+    predicates = [p for p in predicates if p is not _never]
+    return reduce(_either, predicates) if predicates else _never
+
+# filter() predicate keeping non-NULL values
+_NOT_NULL = partial(is_not, None)
+
+# Rows pulled from a table scan per WHERE/LIMIT check
+SCAN_CHUNK_SIZE = 256
+
+class _AggregateSink:
+    """Running state of one aggregate, fed a scan chunk's values at a time"""
+    __slots__ = ('function', 'count', 'value')
+    
+    def __init__(self, function: str):
+        self.function = function
+        self.count = 0
+        self.value = None
+    
+    def push(self, values: list):
+        if not values: return
+        self.count += len(values)
+        function = self.function
+        if function in ('SUM', 'AVG'):
+            self.value = sum(values, self.value or 0)
+        elif function == 'MIN':
+            low = min(values)
+            if self.value is None or low < self.value: self.value = low
+        elif function == 'MAX':
+            high = max(values)
+            if self.value is None or high > self.value: self.value = high
+    
+    def finalize(self) -> Any:
+        if self.function == 'COUNT': return self.count
+        if not self.count: return None
+        if self.function == 'AVG': return self.value / self.count
+        return self.value
+
+# Comparisons a compiled WHERE runs as one map over a column of values
+_BATCH_COMPARATORS = {'=': eq, '!=': ne, '<': lt, '>': gt, '<=': le, '>=': ge}
+
+def _membership(values):
+    # IN lists become sets for O(1) lookups; unhashable members keep the list
+    try:
+        return frozenset(values)
+    except TypeError:
+        return values
+
+def _contains(members, value):
+    try:
+        return value in members
+    except TypeError:
+        # Unhashable value probing a set: it cannot equal any member
+        return False
+
+def _null_safe(compare, left, right):
+    # = and != see NULL as an ordinary value; ordering against NULL is false
+    if (left is None or right is None) and compare is not eq and compare is not ne:
+        return False
+    return compare(left, right)
+
+# Cache marker for shapes whose literals cannot be lifted safely
+_NO_TEMPLATE = object()
+
+@lru_cache(maxsize=256)
+def _load_foreign_key(text: str) -> Dict[str, Any]:
+    # Tables often repeat the same REFERENCES clause; the parsed dict is
+    # shared between columns and only ever read
+    return _json_loads(text)
+
+@lru_cache(maxsize=1024)
+def _compile_like(pattern: str):
+    """Case-insensitive matcher for a LIKE pattern"""
+    # Prefix, suffix, substring and exact patterns skip the regex engine
+    leading, trailing = pattern.startswith('%'), pattern.endswith('%')
+    literal = pattern[1:] if leading else pattern
+    if trailing and literal:
+        literal = literal[:-1]
+    if '%' not in literal and '_' not in literal:
+        literal = literal.lower()
+        if leading and trailing:
+            return lambda text: literal in text.lower()
+        if trailing:
+            return lambda text: text.lower().startswith(literal)
+        if leading:
+            return lambda text: text.lower().endswith(literal)
+        return lambda text: text.lower() == literal
+    
+    regex = ''.join('.*' if part == '%' else '.' if part == '_' else re.escape(part)
+                    for part in re.split('([%_])', pattern))
+    fullmatch = re.compile(regex, re.IGNORECASE | re.DOTALL).fullmatch
+    return lambda text: fullmatch(text) is not None
+
+def _lift_literals(sql: str):
+    """Return the statement shape and the literal values lifted out of it"""
+    values = []
+    
+    def lift(match):
+        text = match.group()
+        first = text[0]
+        if first in 'xX':
+            return text
+        if first in '\'"':
+            values.append(text[1:-1].replace(first * 2, first))
+            return '\x00s'
+        if '.' in text:
+            values.append(float(text))
+            return '\x00f'
+        values.append(int(text))
+        return '\x00i'
+    
+    return _LITERAL_RE.sub(lift, sql), values
+
+def _template_sql(sql: str) -> str:
+    """Replace each liftable literal with a sentinel of the same token class"""
+    index = -1
+    
+    def stand_in(match):
+        nonlocal index
+        text = match.group()
+        if text[0] in 'xX':
+            return text
+        index += 1
+        if text[0] in '\'"':
+            return f"'\x00{index}'"
+        if '.' in text:
+            return f"{_SENTINEL_BASE + index}.5"
+        return str(_SENTINEL_BASE + index)
+    
+    return _LITERAL_RE.sub(stand_in, sql)
+
+def _literal_paths(template: Dict[str, Any], count: int) -> list:
+    """Locate every sentinel in a template AST as (path, literal index)"""
+    slots = {}
+    for index in range(count):
+        slots[f"\x00{index}"] = index
+        slots[_SENTINEL_BASE + index] = index
+        slots[_SENTINEL_BASE + index + 0.5] = index
+    
+    found = []
+    
+    def walk(node, path):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                walk(value, path + (key,))
+        elif isinstance(node, list):
+            for position, item in enumerate(node):
+                walk(item, path + (position,))
+        elif isinstance(node, (str, int, float)) and not isinstance(node, bool):
+            index = slots.get(node)
+            if index is not None:
+                found.append((path, index))
+    
+    walk(template, ())
+    return found
+
+def _bind_literals(template: Dict[str, Any], paths: list, values: List[Any]) -> Dict[str, Any]:
+    # Copy only the containers on the way to a literal; untouched branches
+    # are shared with the template, which is safe as execution never
+    # mutates a parsed statement
+    root = template.copy()
+    copied = {(): root}
+    for path, index in paths:
+        node = root
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            child = copied.get(prefix)
+            if child is None:
+                child = node[path[depth - 1]].copy()
+                node[path[depth - 1]] = child
+                copied[prefix] = child
+            node = child
+        node[path[-1]] = values[index]
+    return root
+
 class QueryExecutor:
     def __init__(self, storage: StorageEngine, schema: SchemaManager, 
                  index_manager: IndexManager, hasher: BLAKE2Hasher,
@@ -32,6 +309,16 @@ class QueryExecutor:
         self.transaction_manager = transaction_manager or TransactionManager()
         self.parser = SQLParser()
         self.table_pages: Dict[str, List[int]] = {}
+        self.last_insert_rowid: Optional[int] = None
+        self._plan_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._predicate_cache: 'OrderedDict[tuple, Any]' = OrderedDict()
+        # Last AUTOINCREMENT value per table and column, seeded lazily
+        self._autoinc: Dict[str, Dict[str, int]] = {}
+        # __ribbit_columns rows per table, in position order; dropped on DDL
+        self._catalog_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Decoded view definitions by name, None for names that are not
+        # views; dropped on CREATE/DROP VIEW and rollback
+        self._view_cache: Dict[str, Optional[Dict[str, Any]]] = {}
         
         # Initialize system tables
         SystemTables.create_system_tables(self)
@@ -41,13 +328,21 @@ class QueryExecutor:
         # Load tables from system tables
         try:
             stored_tables = SystemTables.get_all_tables(self)
+            
+            # One pass over the column catalog instead of one per table
+            catalog = self._catalog_cache
+            for col_data in self.select('__ribbit_columns'):
+                catalog.setdefault(col_data['table_name'], []).append(col_data)
+            for columns_data in catalog.values():
+                columns_data.sort(key=lambda x: x['position'])
+            
             for table_info in stored_tables:
                 table_name = table_info['name']
                 # Don't skip system tables - they need to be in schema too
                 # if SystemTables.is_system_table(table_name):
                 #     continue
                 
-                columns_data = SystemTables.get_table_columns(self, table_name)
+                columns_data = self._table_columns(table_name)
                 columns = []
                 for col_data in columns_data:
                     columns.append(Column(
@@ -59,7 +354,7 @@ class QueryExecutor:
                         default=col_data.get('default_value'),
                         autoincrement=bool(col_data.get('autoincrement', 0)),
                         check=col_data.get('check_expression'),
-                        foreign_key=json.loads(col_data['foreign_key']) if col_data.get('foreign_key') else None
+                        foreign_key=_load_foreign_key(col_data['foreign_key']) if col_data.get('foreign_key') else None
                     ))
                 
                 table = Table(table_name, columns)
@@ -69,59 +364,65 @@ class QueryExecutor:
         except Exception:
             pass # First run or error loading metadata
     
+    def _table_columns(self, table_name: str) -> List[Dict[str, Any]]:
+        columns = self._catalog_cache.get(table_name)
+        if columns is None:
+            columns = self._catalog_cache[table_name] = SystemTables.get_table_columns(self, table_name)
+        return list(columns)
+    
     def execute(self, sql: str) -> Any:
-        parsed = self.parser.parse(sql)
-        query_type = parsed['type']
+        parsed = self._plan(sql)
+        handler = self._DISPATCH.get(parsed['type'])
+        if handler is None:
+            raise UnsupportedFeatureError(parsed['type'])
         
         try:
-            if query_type == 'SELECT':
-                return self.execute_select(parsed)
-            elif query_type == 'INSERT':
-                return self.execute_insert(parsed)
-            elif query_type == 'UPDATE':
-                return self.execute_update(parsed)
-            elif query_type == 'DELETE':
-                return self.execute_delete(parsed)
-            elif query_type == 'CREATE':
-                return self.execute_create(parsed)
-            elif query_type == 'CREATE_VIEW':
-                return self.execute_create_view(parsed)
-            elif query_type == 'CREATE_INDEX':
-                return self.execute_create_index(parsed)
-            elif query_type == 'ALTER':
-                return self.execute_alter(parsed)
-            elif query_type == 'DROP':
-                return self.execute_drop(parsed)
-            elif query_type == 'DROP_VIEW':
-                return self.execute_drop_view(parsed)
-            elif query_type == 'DROP_INDEX':
-                return self.execute_drop_index(parsed)
-            elif query_type == 'PRAGMA':
-                return self.execute_pragma(parsed)
-            elif query_type == 'BEGIN':
-                return self.execute_begin()
-            elif query_type == 'COMMIT':
-                return self.execute_commit()
-            elif query_type == 'ROLLBACK':
-                return self.execute_rollback(parsed)
-            elif query_type == 'SAVEPOINT':
-                return self.execute_savepoint(parsed)
-            elif query_type == 'RELEASE':
-                return self.execute_release(parsed)
-            elif query_type == 'DESCRIBE':
-                return self.execute_describe(parsed)
-            elif query_type == 'SHOW':
-                return self.execute_show(parsed)
-            elif query_type == 'EXPLAIN':
-                return self.execute_explain(parsed)
-            else:
-                raise UnsupportedFeatureError(query_type)
+            return handler(self, parsed)
         except Exception as e:
             if self.transaction_manager.has_active_transaction():
                 # In strict mode, might rollback on error
                 pass
             raise
     
+    def _plan(self, sql: str) -> Dict[str, Any]:
+        try:
+            shape, values = _lift_literals(sql)
+        except ValueError:
+            # Malformed number; let the parser report it
+            return self.parser.parse(sql)
+        
+        cache = self._plan_cache
+        entry = cache.get(shape)
+        if entry is not None:
+            cache.move_to_end(shape)
+            template, paths = entry
+            if template is not _NO_TEMPLATE:
+                return _bind_literals(template, paths, values)
+            return self.parser.parse(sql)
+        
+        parsed = self.parser.parse(sql)
+        
+        # Parsing is purely syntactic, so a plan never goes stale on DDL. The
+        # template is only kept if binding it reproduces this exact parse.
+        template, paths = _NO_TEMPLATE, None
+        if not values:
+            # Nothing was lifted, so the shape is the statement itself and
+            # its parse can be reused as is, e.g. BEGIN/COMMIT or DDL
+            template, paths = parsed, []
+        elif parsed['type'] in _PARAMETERIZED_TYPES:
+            try:
+                candidate = self.parser.parse(_template_sql(sql))
+                candidate_paths = _literal_paths(candidate, len(values))
+                if _bind_literals(candidate, candidate_paths, values) == parsed:
+                    template, paths = candidate, candidate_paths
+            except Exception:
+                pass
+        
+        cache[shape] = (template, paths)
+        if len(cache) > PLAN_CACHE_SIZE:
+            cache.popitem(last=False)
+        return parsed
+    
     # ... (rest of methods implemented below) ...
     # Breaking this into parts for size
     
@@ -175,6 +476,7 @@ class QueryExecutor:
             sql = f"CREATE TABLE {table_name} (" + ", ".join([f"{c.name} {c.data_type}" for c in columns]) + ")"
             
             SystemTables.register_table(self, table_name, col_dicts, sql)
+            self._catalog_cache.pop(table_name, None)
             
             # Create PK index
             if table.primary_key:
@@ -217,12 +519,14 @@ class QueryExecutor:
         
         if table_name in self.table_pages:
             del self.table_pages[table_name]
+        self._autoinc.pop(table_name, None)
         
         # Cleanup indexes
         self.index_manager.drop_index(f"{table_name}_pk")
         
         # Remove from system tables
         SystemTables.unregister_table(self, table_name)
+        self._catalog_cache.pop(table_name, None)
         
         return self.schema.drop_table(table_name)
 
@@ -236,6 +540,7 @@ class QueryExecutor:
             raise TableNotFoundError(f"View {view_name} not found")
             
         SystemTables.unregister_view(self, view_name)
+        self._view_cache.pop(view_name, None)
         return True
 
     def execute_insert(self, parsed: Dict[str, Any]) -> int:
@@ -255,91 +560,129 @@ class QueryExecutor:
         elif values and isinstance(values[0], list) and not columns:
              # Basic implementation implies single row INSERT VALUES (...)
              # To support bulk, we'd iterate. For now, assume single row if simple list
-              row_dicts = [dict(zip([col.name for col in table.columns], values))]
-        # Handle parsed VALUES (...)
+              row_dicts = [dict(zip(table.column_names, values))]
+        # Handle parsed VALUES (...), (...), ...
         else:
-             if columns:
-                 row_dicts = [dict(zip(columns, values))]
-             else:
-                 row_dicts = [dict(zip([col.name for col in table.columns], values))]
+             names = columns or table.column_names
+             row_dicts = [dict(zip(names, row)) for row in parsed.get('rows') or [values]]
 
-        count = 0
-        for row_dict in row_dicts:
-             processed_row = {}
-             for col in table.columns:
-                 if col.name in row_dict:
-                     val = row_dict[col.name]
-                 else:
-                     # Handle DEFAULT and AUTOINCREMENT
-                     if col.autoincrement:
-                         val = self._next_autoincrement_value(table_name, col.name)
-                         # Update stats
-                     elif col.default is not None:
-                         val = self._evaluate_default(col.default)
-                     else:
-                         val = None
-                     
-                 # Validate NOT NULL
-                 if col.not_null and val is None:
-                     raise ConstraintViolationError("NOT NULL", f"Column '{col.name}' cannot be NULL")
-                 
-                 processed_row[col.name] = val
-
-             if not table.validate_row(processed_row):
-                 raise ConstraintViolationError("Validation", f"Invalid row for table {table_name}")
-             
-             self._insert_row_internal(table_name, processed_row, table)
-             
-             if self.transaction_manager.has_active_transaction():
-                 undo_op = {
-                     'type': 'DELETE',
-                     'table': table_name,
-                     'row': processed_row
-                 }
-                 self.transaction_manager.get_active_transaction().add_operation(undo_op)
-                 
-             count += 1
+        # An INTEGER PRIMARY KEY doubles as the row id reported to cursors
+        rowid_column = next((col.name for col in table.columns
+                             if col.primary_key and col.data_type == DataType.INTEGER), None)
+
+        # Every row is checked before any is written, so a bad row fails the
+        # whole statement instead of leaving the rows before it behind
+        processed_rows = []
+        # Defaults are evaluated once per statement, so every row of a
+        # multi-row INSERT shares one CURRENT_TIMESTAMP
+        stmt_defaults = {}
+        stmt_now = None
+        try:
+            for row_dict in row_dicts:
+                processed_row = {}
+                for col in table.columns:
+                    if col.name in row_dict:
+                        val = row_dict[col.name]
+                    else:
+                        # Handle DEFAULT and AUTOINCREMENT
+                        if col.autoincrement:
+                            val = self._next_autoincrement_value(table_name, col.name)
+                        elif col.default is not None:
+                            if col.name not in stmt_defaults:
+                                if stmt_now is None:
+                                    stmt_now = datetime.now()
+                                stmt_defaults[col.name] = self._evaluate_default(col.default, stmt_now)
+                            val = stmt_defaults[col.name]
+                        else:
+                            val = None
+                        
+                    # Validate NOT NULL
+                    if col.not_null and val is None:
+                        raise ConstraintViolationError("NOT NULL", f"Column '{col.name}' cannot be NULL")
+                    
+                    processed_row[col.name] = val
+
+                if not table.validate_row(processed_row):
+                    raise ConstraintViolationError("Validation", f"Invalid row for table {table_name}")
+                
+                # Explicit ids must move the counter before the next row draws
+                self._track_autoincrement(table_name, processed_row)
+                processed_rows.append(processed_row)
+        except ConstraintViolationError:
+            # Values drawn for rows that were never written; reseed lazily
+            self._autoinc.pop(table_name, None)
+            raise
         
-        return count
+        self._insert_rows_internal(table_name, processed_rows, table)
+        if rowid_column is not None and processed_rows:
+            self.last_insert_rowid = processed_rows[-1][rowid_column]
+        
+        if processed_rows and self.transaction_manager.has_active_transaction():
+            undo_op = {
+                'type': 'DELETE_ROWS',
+                'table': table_name,
+                'rows': processed_rows
+            }
+            self.transaction_manager.get_active_transaction().add_operation(undo_op)
+        
+        return len(processed_rows)
 
     def _next_autoincrement_value(self, table_name: str, col_name: str) -> int:
-        # Simple max+1 implementation. 
-        # In real world, use a sequence table or page header stats.
-        current_max = 0
-        rows = self._scan_table(table_name)
-        for row in rows:
-            val = row.get(col_name)
-            if isinstance(val, int) and val > current_max:
-                current_max = val
-        return current_max + 1
+        # Still max+1, but the max is found by one scan and then carried
+        # forward by _insert_row_internal instead of rescanned per row
+        counters = self._autoinc.setdefault(table_name, {})
+        if col_name not in counters:
+            current_max = 0
+            for row in self._scan_table(table_name):
+                val = row.get(col_name)
+                if isinstance(val, int) and val > current_max:
+                    current_max = val
+            counters[col_name] = current_max
+        counters[col_name] += 1
+        return counters[col_name]
 
-    def _evaluate_default(self, default_val: Any) -> Any:
+    def _evaluate_default(self, default_val: Any, now: Optional[datetime] = None) -> Any:
         if isinstance(default_val, str):
-            if default_val.upper() == 'CURRENT_TIMESTAMP':
-                return datetime.now().isoformat()
-            if default_val.upper() == 'CURRENT_DATE':
-                return datetime.now().strftime('%Y-%m-%d')
-            if default_val.upper() == 'CURRENT_TIME':
-                return datetime.now().strftime('%H:%M:%S')
+            keyword = default_val.upper()
+            if keyword == 'CURRENT_TIMESTAMP':
+                return (now or datetime.now()).isoformat()
+            if keyword == 'CURRENT_DATE':
+                return (now or datetime.now()).strftime('%Y-%m-%d')
+            if keyword == 'CURRENT_TIME':
+                return (now or datetime.now()).strftime('%H:%M:%S')
         return default_val
 
     def execute_select(self, parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
         table_name = parsed['table']
         
         # 1. Get Source Rows (Table Scan or View)
-        all_rows = self._get_source_rows(table_name)
-        
-        # Handle JOINs
-        if parsed.get('joins'):
+        folded = parsed.get('aggregates') and not (parsed.get('joins') or parsed.get('group_by')) \
+            and self._view_definition(table_name) is None and self.schema.table_exists(table_name)
+        if folded and self._is_bare_count(parsed):
+             # Nothing but COUNT(*) over a whole table: count slots, decode no rows
+             count = self._count_records(table_name)
+             all_rows = [{agg['alias']: count for agg in parsed['aggregates']}]
+        elif folded:
+             all_rows = [self._aggregate_scan(table_name, parsed)]
+        elif parsed.get('joins'):
+             all_rows = self._get_source_rows(table_name, self._referenced_columns(parsed))
              all_rows = self._execute_joins(all_rows, parsed['joins'], table_name)
-        
-        # Apply WHERE clause
-        if parsed.get('where'):
-             all_rows = self._filter_rows_advanced(all_rows, parsed['where'])
+             if parsed.get('where'):
+                 all_rows = self._filter_rows_advanced(all_rows, parsed['where'])
+        else:
+             # WHERE is applied during the scan, and a plain LIMIT stops it
+             # early when nothing after the filter reorders or merges rows
+             limit = None
+             if parsed.get('limit') and not (parsed.get('aggregates') or parsed.get('group_by')
+                                             or parsed.get('distinct') or parsed.get('order_by')):
+                 limit = parsed['limit'] + (parsed.get('offset') or 0)
+             all_rows = self._get_source_rows(table_name, self._referenced_columns(parsed),
+                                              parsed.get('where'), limit)
         
         # Handle aggregates and GROUP BY
         if parsed.get('aggregates') or parsed.get('group_by'):
-             all_rows = self._execute_aggregates(all_rows, parsed)
+             if not folded:
+                 all_rows = self._execute_aggregates(all_rows, parsed)
         else:
              # Apply DISTINCT
              if parsed.get('distinct'):
@@ -367,29 +710,69 @@ class QueryExecutor:
              union_info = parsed['union']
              next_rows = self.execute_select(union_info['next'])
              
+             # Result columns are named by the first SELECT; the next one's
+             # rows are matched to them by position
+             if all_rows and next_rows:
+                 columns = list(all_rows[0])
+                 if list(next_rows[0]) != columns and len(next_rows[0]) == len(columns):
+                     next_rows = [dict(zip(columns, row.values())) for row in next_rows]
+             
              if union_info['all']:
                  all_rows.extend(next_rows)
              else:
-                 # Union Distinct
+                 # Union Distinct: a row's items in select-list order make
+                 # the key, so no per-row sort; unhashable values go by pickle
                  seen = set()
                  unique_rows = []
-                 # We need to hash rows. Using tuple of sorted items.
-                 # Assuming JSON-serializable types roughly.
-                 for row in all_rows + next_rows:
-                     # Handle non-hashable values (like lists/dicts)? 
-                     # For basic types it works.
+                 for row in chain(all_rows, next_rows):
+                     key = tuple(row.items())
                      try:
-                         key = tuple(sorted([(k, v) for k, v in row.items() if k is not None]))
-                         if key not in seen:
-                             seen.add(key)
-                             unique_rows.append(row)
-                     except:
-                         # Fallback if unhashable
+                         hash(key)
+                     except TypeError:
+                         key = pickle.dumps(key)
+                     if key not in seen:
+                         seen.add(key)
                          unique_rows.append(row)
                  all_rows = unique_rows
         
         return all_rows
 
+    def _referenced_columns(self, parsed: Dict[str, Any]) -> Optional[set]:
+        """Columns a single-table SELECT reads, or None when it needs whole rows"""
+        if parsed.get('joins') or '*' in parsed['columns']:
+            return None
+        
+        needed = set()
+        if parsed.get('aggregates') or parsed.get('group_by'):
+            needed.update(parsed.get('group_by') or ())
+            needed.update(agg['column'] for agg in parsed['aggregates'] if agg['column'] != '*')
+        else:
+            needed.update(parsed['columns'])
+        needed.update(order['column'] for order in parsed.get('order_by') or ())
+        
+        if parsed.get('where') and not self._where_columns(parsed['where'], needed):
+            return None
+        return needed
+    
+    def _where_columns(self, node: Any, out: set) -> bool:
+        # False when the clause has a shape whose column uses are unknown
+        if not isinstance(node, dict):
+            return True
+        if 'column' in node:
+            out.add(node['column'])
+            return True
+        node_type = node.get('type')
+        if node_type == 'COMPOUND':
+            return all(self._where_columns(cond, out) for cond in node['conditions'])
+        if node_type == 'identifier':
+            out.add(node['value'])
+            return True
+        if node_type == 'literal':
+            return True
+        if 'operator' in node:
+            return self._where_columns(node.get('left'), out) and self._where_columns(node.get('right'), out)
+        return False
+
     def execute_update(self, parsed: Dict[str, Any]) -> int:
         table_name = parsed['table']
         table = self.schema.get_table(table_name)
@@ -400,30 +783,32 @@ class QueryExecutor:
         updates = parsed['updates']
         where_clause = parsed.get('where')
         
-        all_rows = self._scan_table(table_name)
-        
-        updated_rows = []
-        count = 0
-        
         # Check transaction
         if self.transaction_manager.has_active_transaction():
             # Log for rollback
             pass
-
-        for row in all_rows:
-             should_update = True
-             if where_clause:
-                 should_update = self._matches_where_advanced(row, where_clause)
+        
+        # Collected up front: relocated rows are appended to the table and
+        # must not be seen (and updated again) by this same scan
+        matches = self._matching_records(table_name, table, where_clause)
+        
+        for page, offset, row_size, row in matches:
+             self._release_autoincrement(table_name, row)
+             for col, value in updates.items():
+                 if col in row:
+                     row[col] = value
              
-             if should_update:
-                 for col, value in updates.items():
-                     if col in row:
-                         row[col] = value
-                 count += 1
-             updated_rows.append(row)
-        
-        self._rewrite_table(table_name, updated_rows, table)
-        return count
+             serialized_row = self._serialize_row(row, table)
+             if len(serialized_row) <= row_size:
+                 # Fits the old slot; the size word keeps the slot length and
+                 # pickle ignores the stale tail
+                 page.overwrite(offset + 4, serialized_row)
+                 self._track_autoincrement(table_name, row)
+             else:
+                 page.overwrite(offset, struct.pack('<I', row_size | _TOMBSTONE))
+                 self._insert_row_internal(table_name, row, table)
+        
+        return len(matches)
 
     def execute_delete(self, parsed: Dict[str, Any]) -> int:
         table_name = parsed['table']
@@ -433,16 +818,19 @@ class QueryExecutor:
              raise TableNotFoundError(table_name)
         
         where_clause = parsed.get('where')
-        all_rows = self._scan_table(table_name)
         
-        if where_clause:
-             remaining_rows = [row for row in all_rows if not self._matches_where_advanced(row, where_clause)]
-             deleted_count = len(all_rows) - len(remaining_rows)
-        else:
-             deleted_count = len(all_rows)
-             remaining_rows = []
+        if not where_clause:
+             deleted_count = len(self._scan_table(table_name))
+             self._rewrite_table(table_name, [], table)
+             return deleted_count
+        
+        # Matching rows are tombstoned in place; VACUUM reclaims the space
+        deleted_count = 0
+        for page, offset, row_size, row in self._matching_records(table_name, table, where_clause):
+            page.overwrite(offset, struct.pack('<I', row_size | _TOMBSTONE))
+            self._release_autoincrement(table_name, row)
+            deleted_count += 1
         
-        self._rewrite_table(table_name, remaining_rows, table)
         return deleted_count
 
     def execute_pragma(self, parsed: Dict[str, Any]) -> Any:
@@ -454,16 +842,24 @@ class QueryExecutor:
         elif name == 'table_info':
              if not self.table_exists(args[0]):
                  return []
-             return SystemTables.get_table_columns(self, args[0])
+             return self._table_columns(args[0])
         elif name == 'database_list':
              return [{'file': 'main', 'name': 'main'}]
+        elif name == 'vacuum':
+             # Compact away tombstoned records
+             names = args or list(self.table_pages)
+             for table_name in names:
+                 table = self.schema.get_table(table_name)
+                 if table:
+                     self._rewrite_table(table_name, self._scan_table(table_name), table)
+             return len(names)
         else:
              return None
 
-    def execute_begin(self):
+    def execute_begin(self, parsed=None):
         self.transaction_manager.begin_transaction()
     
-    def execute_commit(self):
+    def execute_commit(self, parsed=None):
         if self.transaction_manager.has_active_transaction():
              self.transaction_manager.get_active_transaction().commit()
              self.transaction_manager.active_transaction = None
@@ -488,6 +884,7 @@ class QueryExecutor:
         # Execute undo in reverse order
         for op in reversed(ops_to_undo):
             self._undo_operation(op)
+        self._view_cache.clear()
 
     def _undo_operation(self, op: Dict[str, Any]):
         # Removed try/except to debug
@@ -510,6 +907,16 @@ class QueryExecutor:
             else:
                 # Best effort: match all cols
                 pass
+        elif op['type'] == 'DELETE_ROWS':
+            # Undo of a multi-row INSERT: one scan for the whole batch
+            table_name = op['table']
+            table = self.schema.get_table(table_name)
+            if table.primary_key:
+                pk_values = [row.get(table.primary_key) for row in op['rows']]
+                self.execute_delete({
+                    'table': table_name,
+                    'where': {'column': table.primary_key, 'operator': 'IN', 'value': pk_values}
+                })
         elif op['type'] == 'INSERT':
             # Undo of DELETE is INSERT
             self.insert(op['table'], op['row'])
@@ -531,7 +938,7 @@ class QueryExecutor:
         if not self.table_exists(table_name):
              raise TableNotFoundError(table_name)
         
-        columns = SystemTables.get_table_columns(self, table_name)
+        columns = self._table_columns(table_name)
         # Format for output
         result = []
         for col in columns:
@@ -564,7 +971,8 @@ class QueryExecutor:
     # ... Helper methods like _scan_table, _matches_where_advanced, etc. same as before ...
     # Rewriting them to ensure they use self.storage correctly and handle system tables
     
-    def _scan_table(self, table_name: str) -> List[Dict[str, Any]]:
+    def _scan_table(self, table_name: str, columns: Optional[set] = None,
+                    where: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         # System tables are stored as normal tables now, so we just scan them.
         # No special handling needed here unless they were virtual.
         
@@ -575,67 +983,206 @@ class QueryExecutor:
         table = self.schema.get_table(table_name)
         if not table: return []
         
-        rows = []
-        for page_id in self.table_pages[table_name]:
+        if where is None and limit is None:
+            return [record[3] for record in self._iter_records(table_name, table, columns)]
+        
+        # With a limit, pages past the rows it needs are never read or decoded
+        result = []
+        for chunk in self._scan_chunks(table_name, table, columns, where):
+            result.extend(chunk)
+            if limit is not None and len(result) >= limit:
+                del result[limit:]
+                break
+        return result
+    
+    def _scan_chunks(self, table_name: str, table: Table, columns: Optional[set] = None,
+                     where: Optional[Dict[str, Any]] = None):
+        """Yield a table's rows SCAN_CHUNK_SIZE at a time, WHERE already applied
+        
+        Chunks are decoded and filtered on the calling thread. Both steps
+        are Python code that holds the GIL, so splitting chunks across
+        worker threads measured no faster, and worker processes would have
+        to pickle every row and could not receive the compiled filters.
+        """
+        rows = (record[3] for record in self._iter_records(table_name, table, columns))
+        keep = self._compile_where(where) if where else None
+        while True:
+            chunk = list(islice(rows, SCAN_CHUNK_SIZE))
+            if not chunk:
+                return
+            yield keep(chunk) if keep else chunk
+    
+    def _iter_records(self, table_name: str, table: Table, columns: Optional[set] = None,
+                      as_values: bool = False):
+        """Yield (page, offset, slot size, row) for every live row of a table
+        
+        With columns given, rows only carry those of the table's columns
+        (projection pushdown); the hash check still covers the whole row.
+        With as_values too, a row is the tuple of those columns' values, in
+        table order, instead of a dict.
+        """
+        names = table.column_names
+        defaults = tuple(col.default for col in table.columns)
+        width = len(names)
+        
+        project = None
+        if columns is not None:
+            picked = [i for i, name in enumerate(names) if name in columns]
+            picked_names = tuple(names[i] for i in picked)
+            if as_values:
+                if len(picked) > 1:
+                    project = itemgetter(*picked)
+                elif picked:
+                    index = picked[0]
+                    project = lambda row_data: (row_data[index],)
+                else:
+                    project = lambda row_data: ()
+            elif len(picked) > 1:
+                pick = itemgetter(*picked)
+                project = lambda row_data: dict(zip(picked_names, pick(row_data)))
+            elif picked:
+                index, name = picked[0], picked_names[0]
+                project = lambda row_data: {name: row_data[index]}
+            else:
+                project = lambda row_data: {}
+        
+        unpack_size = _SIZE_WORD.unpack_from
+        loads = pickle.loads
+        
+        page_ids = self.table_pages.get(table_name, ())
+        for position, page_id in enumerate(page_ids):
             page = self.storage.get_page(page_id)
+            # Let the OS read the next page while this one is decoded
+            if position + 1 < len(page_ids):
+                self.storage.prefetch_page(page_ids[position + 1])
             if not page: continue
             
+            # Decode the whole page first so its hashes are checked in one batch
+            buf = memoryview(page.data)
+            data_end = len(page.data) - page.get_free_space()
+            offsets, sizes, rows_data, hashes = [], [], [], []
             offset = 0
+            while offset + 4 <= data_end:
+                size_word = unpack_size(buf, offset)[0]
+                if not size_word: break
+                row_size = size_word & _SIZE_MASK
+                if offset + 4 + row_size > data_end: break
+                
+                if not size_word & _TOMBSTONE:
+                    try:
+                        row_obj = loads(buf[offset + 4:offset + 4 + row_size])
+                        if type(row_obj) is tuple:
+                            row_hash, row_data = row_obj[0], row_obj[1:]
+                        else:
+                            # Records written before the flat tuple layout
+                            row_hash, row_data = row_obj['hash'], row_obj['data']
+                    except (pickle.UnpicklingError, EOFError, ValueError,
+                            TypeError, KeyError, IndexError):
+                        # Corrupt record; its size can't be trusted either
+                        break
+                    offsets.append(offset)
+                    sizes.append(row_size)
+                    hashes.append(row_hash)
+                    rows_data.append(row_data)
+                
+                offset += 4 + row_size
+            
+            verified = self.hasher.verify_rows(rows_data, hashes)
+            for offset, row_size, row_data, ok in zip(offsets, sizes, rows_data, verified):
+                if not ok:
+                    continue
+                if len(row_data) < width:
+                    # Schema evolution: Columns added after row insertion
+                    row_data = list(row_data) + list(defaults[len(row_data):])
+                if project is not None:
+                    row_dict = project(row_data)
+                else:
+                    row_dict = dict(zip(names, row_data))
+                yield page, offset, row_size, row_dict
+    
+    def _is_bare_count(self, parsed: Dict[str, Any]) -> bool:
+        if parsed.get('where'):
+            return False
+        return all(agg['function'] == 'COUNT' and agg['column'] == '*' for agg in parsed['aggregates'])
+    
+    def _count_records(self, table_name: str) -> int:
+        """Number of live rows in a table, read from the slot size words alone
+        
+        Rows are neither unpickled nor hash-checked, so this is only for
+        COUNT(*) with no WHERE, where no row value is ever looked at.
+        """
+        unpack_size = _SIZE_WORD.unpack_from
+        count = 0
+        for page_id in self.table_pages.get(table_name, ()):
+            page = self.storage.get_page(page_id)
+            if not page: continue
+            
             data_end = len(page.data) - page.get_free_space()
-            while offset < data_end:
-                try:
-                    if offset + 4 > data_end: break
-                    size_bytes = page.read_record(offset, 4)
-                    if not size_bytes or size_bytes == b'\x00\x00\x00\x00': break
-                    row_size = struct.unpack('<I', size_bytes)[0]
-                    if offset + 4 + row_size > data_end: break
-                    
-                    serialized_row = page.read_record(offset + 4, row_size)
-                    row_obj = pickle.loads(serialized_row)
-                    row_data = row_obj['data']
-                    row_hash = row_obj['hash']
-                    
-                    if self.hasher.verify_row(row_data, row_hash):
-                        row_dict = {}
-                        for i, col in enumerate(table.columns):
-                            if i < len(row_data):
-                                row_dict[col.name] = row_data[i]
-                            else:
-                                # Schema evolution: Column added after row insertion
-                                row_dict[col.name] = col.default
-                        rows.append(row_dict)
-                    
-                    offset += 4 + row_size
-                except: break
-        return rows
+            offset = 0
+            while offset + 4 <= data_end:
+                size_word = unpack_size(page.data, offset)[0]
+                if not size_word: break
+                row_size = size_word & _SIZE_MASK
+                if offset + 4 + row_size > data_end: break
+                if not size_word & _TOMBSTONE:
+                    count += 1
+                offset += 4 + row_size
+        return count
     
-    def _insert_row_internal(self, table_name, row_dict, table):
-        row_data = [row_dict.get(col.name) for col in table.columns]
+    def _serialize_row(self, row_dict, table) -> bytes:
+        # A flat (hash, *values) tuple: no per-row dict framing or key
+        # strings, and pickle decodes it about twice as fast
+        row_data = list(map(row_dict.get, table.column_names))
         row_hash = self.hasher.hash_row(row_data)
-        
-        serialized_row = pickle.dumps({'data': row_data, 'hash': row_hash})
-        row_size = len(serialized_row)
-        row_with_size = struct.pack('<I', row_size) + serialized_row
-        
-        if table_name not in self.table_pages: self.table_pages[table_name] = []
-        
-        if not self.table_pages[table_name]:
-            page = self.storage.allocate_page(Page.TYPE_TABLE)
-            self.table_pages[table_name] = [page.header.page_id]
+        return pickle.dumps((row_hash, *row_data))
+    
+    def _insert_row_internal(self, table_name, row_dict, table):
+        self._insert_rows_internal(table_name, [row_dict], table)
+    
+    def _insert_rows_internal(self, table_name, row_dicts, table):
+        """Append rows to a table, fetching its last page once per batch"""
+        page_ids = self.table_pages.setdefault(table_name, [])
+        if page_ids:
+            page = self.storage.get_page(page_ids[-1])
         else:
-            page_id = self.table_pages[table_name][-1]
-            page = self.storage.get_page(page_id)
-        
-        if page.get_free_space() < len(row_with_size):
             page = self.storage.allocate_page(Page.TYPE_TABLE)
-            self.table_pages[table_name].append(page.header.page_id)
+            page_ids.append(page.header.page_id)
         
-        offset = len(page.data) - page.get_free_space()
-        page.write_record(offset, row_with_size)
+        pack_size = _SIZE_WORD.pack
+        for row_dict in row_dicts:
+            serialized_row = self._serialize_row(row_dict, table)
+            row_with_size = pack_size(len(serialized_row)) + serialized_row
+            
+            free_space = page.get_free_space()
+            if free_space < len(row_with_size):
+                page = self.storage.allocate_page(Page.TYPE_TABLE)
+                page_ids.append(page.header.page_id)
+                free_space = page.get_free_space()
+            
+            page.write_record(len(page.data) - free_space, row_with_size)
+            self._track_autoincrement(table_name, row_dict)
         
         # PK Index update would go here
+    
+    def _track_autoincrement(self, table_name, row_dict):
+        # Explicit values above the AUTOINCREMENT counter move it forward
+        counters = self._autoinc.get(table_name)
+        if counters:
+            for col_name, last in counters.items():
+                val = row_dict.get(col_name)
+                if isinstance(val, int) and val > last:
+                    counters[col_name] = val
+    
+    def _release_autoincrement(self, table_name, row_dict):
+        # Removing the row that holds the max means the next value is rescanned
+        counters = self._autoinc.get(table_name)
+        if counters and any(row_dict.get(col_name) == last for col_name, last in counters.items()):
+            del self._autoinc[table_name]
         
     def _rewrite_table(self, table_name, rows, table):
+        # The rows are replaced wholesale, so the counter is reseeded lazily
+        self._autoinc.pop(table_name, None)
+        
         # Clear existing pages
         if table_name in self.table_pages:
             for page_id in self.table_pages[table_name]:
@@ -648,12 +1195,7 @@ class QueryExecutor:
             self._insert_row_internal(table_name, row, table)
 
     def _parse_data_type(self, type_str: str) -> DataType:
-        type_upper = type_str.upper()
-        if type_upper in ('INTEGER', 'INT'): return DataType.INTEGER
-        elif type_upper in ('REAL', 'FLOAT', 'DOUBLE'): return DataType.REAL
-        elif type_upper in ('TEXT', 'VARCHAR', 'STRING', 'JSON'): return DataType.TEXT
-        elif type_upper == 'BLOB': return DataType.BLOB
-        else: return DataType.TEXT
+        return _TYPE_MAP.get(type_str.upper(), DataType.TEXT)
 
     def table_exists(self, table_name: str) -> bool:
         # System tables must exist in schema to be queried/inserted
@@ -725,24 +1267,52 @@ class QueryExecutor:
         return result
 
     def _inner_join(self, left, right, on):
-        result = []
-        for left_row in left:
-            for right_row in right:
-                if left_row.get(on['left']) == right_row.get(on['right']):
-                    result.append({**left_row, **right_row})
-        return result
+        # {**a, **b} is the cheapest way CPython has to merge two dicts; the
+        # comprehension saves the bound append call per output row
+        return [{**left_row, **right_row}
+                for left_row, matches in self._probe_join(left, right, on)
+                for right_row in matches]
 
     def _left_join(self, left, right, on):
         result = []
-        for left_row in left:
-            matched = False
-            for right_row in right:
-                if left_row.get(on['left']) == right_row.get(on['right']):
-                    result.append({**left_row, **right_row})
-                    matched = True
-            if not matched: result.append(left_row)
+        for left_row, matches in self._probe_join(left, right, on):
+            if matches: result.extend([{**left_row, **right_row} for right_row in matches])
+            else: result.append(left_row)
         return result
 
+    def _probe_join(self, left, right, on):
+        """Pair each left row with its matching right rows, in right order
+
+        The smaller side is hashed on its ON column once, so a join costs
+        O(N + M) rather than comparing every pair of rows. Both sides are
+        already whole lists by this point, so a merge join saves no memory,
+        and its two-pointer walk runs in Python: even on inputs already
+        sorted by the key it is slower than the dict probe.
+        """
+        left_col, right_col = on['left'], on['right']
+        try:
+            if len(left) < len(right):
+                # Build on the left and collect matches per left row, so the
+                # output order is the same as when probing from the left
+                index = {}
+                for position, left_row in enumerate(left):
+                    index.setdefault(left_row.get(left_col), []).append(position)
+                buckets = [[] for _ in left]
+                for right_row in right:
+                    for position in index.get(right_row.get(right_col), ()):
+                        buckets[position].append(right_row)
+                return list(zip(left, buckets))
+            
+            index = {}
+            for right_row in right:
+                index.setdefault(right_row.get(right_col), []).append(right_row)
+            return [(left_row, index.get(left_row.get(left_col), ())) for left_row in left]
+        except TypeError:
+            # Unhashable join values: compare every pair
+            return [(left_row, [right_row for right_row in right
+                                if left_row.get(left_col) == right_row.get(right_col)])
+                    for left_row in left]
+
     def _right_join(self, left, right, on):
         return self._left_join(right, left, {'left': on['right'], 'right': on['left']})
 
@@ -752,34 +1322,79 @@ class QueryExecutor:
         having = parsed.get('having')
         
         if group_by:
+            # Group keys are read column by column and zipped into tuples in
+            # C, rather than built with a generator per row
             groups = {}
-            for row in rows:
-                key = tuple(row.get(col) for col in group_by)
-                if key not in groups: groups[key] = []
-                groups[key].append(row)
+            keys = zip(*[map(methodcaller('get', col), rows) for col in group_by])
+            for key, row in zip(keys, rows):
+                groups.setdefault(key, []).append(row)
             
             result = []
             for key, group_rows in groups.items():
-                agg_row = {}
-                for i, col in enumerate(group_by): agg_row[col] = key[i]
-                for agg in aggregates: agg_row[agg['alias']] = self._calculate_aggregate(group_rows, agg)
-                if having:
-                    if self._matches_where_advanced(agg_row, having): result.append(agg_row)
-                else:
-                    result.append(agg_row)
+                agg_row = dict(zip(group_by, key))
+                columns = {}
+                for agg in aggregates: agg_row[agg['alias']] = self._calculate_aggregate(group_rows, agg, columns)
+                result.append(agg_row)
+            if having:
+                result = self._filter_rows_advanced(result, having)
             return result
         else:
             result_row = {}
-            for agg in aggregates: result_row[agg['alias']] = self._calculate_aggregate(rows, agg)
+            columns = {}
+            for agg in aggregates: result_row[agg['alias']] = self._calculate_aggregate(rows, agg, columns)
             return [result_row]
 
-    def _calculate_aggregate(self, rows, agg):
+    def _aggregate_scan(self, table_name: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Ungrouped aggregates folded into a table scan chunk by chunk
+        
+        Rows passing the WHERE feed the running totals directly instead of
+        being gathered into one list for the whole table first.
+        """
+        table = self.schema.get_table(table_name)
+        sinks = [(agg, _AggregateSink(agg['function'])) for agg in parsed['aggregates']]
+        needed = self._referenced_columns(parsed)
+        if needed is not None and not parsed.get('where'):
+            chunks = self._scan_columns(table_name, table, needed)
+        else:
+            chunks = ((chunk, {}) for chunk in self._scan_chunks(table_name, table, needed,
+                                                                 parsed.get('where')))
+        for chunk, columns in chunks:
+            for agg, sink in sinks:
+                col = agg['column']
+                sink.push(chunk if col == '*' else self._column_values(chunk, col, columns))
+        return {agg['alias']: sink.finalize() for agg, sink in sinks}
+
+    def _scan_columns(self, table_name: str, table: Table, columns: set):
+        """Yield (rows, {column: non-NULL values}) a scan chunk at a time
+
+        Values go from the decoded records into one list per column, so
+        no dict is built per row; columns the table lacks come back empty.
+        """
+        names = [name for name in table.column_names if name in columns]
+        rows = (record[3] for record in self._iter_records(table_name, table, columns, as_values=True))
+        while True:
+            chunk = list(islice(rows, SCAN_CHUNK_SIZE))
+            if not chunk:
+                return
+            values = dict.fromkeys(columns, ())
+            values.update(zip(names, zip(*chunk)))
+            yield chunk, {name: list(filter(_NOT_NULL, column)) for name, column in values.items()}
+
+    def _column_values(self, rows, col, columns):
+        # A column's non-NULL values are pulled out once per group, in C, and
+        # shared by every aggregate over that column
+        values = columns.get(col)
+        if values is None:
+            values = columns[col] = list(filter(_NOT_NULL, map(methodcaller('get', col), rows)))
+        return values
+
+    def _calculate_aggregate(self, rows, agg, columns=None):
         func = agg['function']
         col = agg['column']
-        if func == 'COUNT':
-            if col == '*': return len(rows)
-            return sum(1 for row in rows if row.get(col) is not None)
-        values = [row.get(col) for row in rows if row.get(col) is not None]
+        if func == 'COUNT' and col == '*': return len(rows)
+        
+        values = self._column_values(rows, col, {} if columns is None else columns)
+        if func == 'COUNT': return len(values)
         if not values: return None
         if func == 'SUM': return sum(values)
         elif func == 'AVG': return sum(values) / len(values)
@@ -790,36 +1405,329 @@ class QueryExecutor:
     def _apply_distinct(self, rows, columns):
         seen = set()
         result = []
-        for row in rows:
-            if columns == ['*']: key = tuple(sorted(row.items()))
-            else: key = tuple(row.get(col) for col in columns)
+        if columns == ['*']:
+            # Rows from one scan or join share the same columns, so their
+            # values alone identify a row; only mixed shapes need sorted items
+            keys = rows[0].keys() if rows else None
+            if keys and all(row.keys() == keys for row in rows):
+                fingerprints = map(itemgetter(*keys), rows)
+            else:
+                fingerprints = (tuple(sorted(row.items())) for row in rows)
+        else:
+            # Keys are read column by column and zipped into tuples in C
+            fingerprints = zip(*[map(methodcaller('get', col), rows) for col in columns])
+        for key, row in zip(fingerprints, rows):
             if key not in seen:
                 seen.add(key)
                 result.append(row)
         return result
 
     def _apply_order_by(self, rows, order_by):
-        def compare_key(row):
-            keys = []
-            for order in order_by:
-                val = row.get(order['column'])
-                if val is None: val = '' if isinstance(val, str) else 0
-                keys.append(val if order['direction'] == 'ASC' else self._negate_for_sort(val))
-            return tuple(keys)
-        return sorted(rows, key=compare_key)
-
-    def _negate_for_sort(self, val):
-        if isinstance(val, (int, float)): return -val
-        elif isinstance(val, str): return ''.join(chr(255 - ord(c)) for c in val)
-        return val
+        # sorted() is stable, so sorting on each column from the least to the
+        # most significant orders by all of them, each in its own direction
+        for order in reversed(order_by):
+            rows = self._sort_on(rows, order['column'], order['direction'] == 'DESC')
+        return rows
+
+    def _sort_on(self, rows, column, descending):
+        # NULLs sort before every value; they are set aside so the sort key
+        # is the bare column value
+        get = methodcaller('get', column)
+        nulls = [row for row in rows if get(row) is None]
+        if nulls:
+            rows = [row for row in rows if get(row) is not None]
+        rows = sorted(rows, key=get, reverse=descending)
+        return rows + nulls if descending else nulls + rows
 
     def _filter_rows_advanced(self, rows, where_clause):
-        return [row for row in rows if self._evaluate_condition(row, where_clause)]
+        return self._compile_where(where_clause)(rows)
+
+    def _compile_where(self, where_clause):
+        """Compile a WHERE clause into a filter over a whole list of rows
+
+        Simple column/literal comparisons are evaluated column-at-a-time with
+        map() and compress(), so the per-row work stays in C; anything else
+        falls back to _evaluate_condition row by row. The compiled filter is
+        cached per clause shape and the literals are bound on each call.
+        """
+        values = []
+        shape = self._where_shape(where_clause, values)
+        
+        cache = self._predicate_cache
+        run = cache.get(shape)
+        if run is None:
+            # Shapes name columns, not schema objects, so DDL never stales them
+            run = cache[shape] = self._build_filter(shape)
+            if len(cache) > PREDICATE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(shape)
+        return lambda rows: run(rows, values)
+
+    def _where_shape(self, node, values):
+        """Hashable shape of a WHERE clause; literals are appended to values
+
+        Literals are reduced to their type, so "age > 18" and "age > 19"
+        share a shape and differ only in the values bound at run time.
+        Conditions with no batch form are bound as compiled predicates.
+        """
+        if isinstance(node, dict):
+            if node.get('type') == 'COMPOUND':
+                terms = tuple(self._where_shape(c, values) for c in node['conditions'])
+                return ('COMPOUND', terms, tuple(node['operators']))
+            if 'column' in node:
+                value = node['value']
+                # IN lists are made sets once per statement, not once per chunk
+                if node['operator'] == 'IN' and isinstance(value, (list, tuple)):
+                    values.append(_membership(value))
+                else:
+                    values.append(value)
+                return ('CMP', node['column'], node['operator'],
+                        type(value).__name__, len(values) - 1)
+        # Anything else runs as a compiled row predicate, built here once per
+        # statement rather than for every chunk the scan feeds through it
+        values.append(self._compile_condition(node))
+        return ('ROW', len(values) - 1)
+
+    def _build_filter(self, shape):
+        """Build run(rows, values) for a shape from _where_shape"""
+        kind = shape[0]
+        
+        if kind == 'ROW':
+            slot = shape[1]
+            def row_by_row(rows, values):
+                return list(filter(values[slot], rows))
+            return row_by_row
+        
+        if kind == 'COMPOUND':
+            groups = [[self._build_filter(term) for term in sorted(group, key=_shape_cost)]
+                      for group in _and_groups(shape[1], shape[2])]
+            
+            def run_and(filters, rows, values):
+                for run in filters:
+                    if not rows:
+                        break
+                    rows = run(rows, values)
+                return rows
+            
+            if len(groups) == 1:
+                return lambda rows, values: run_and(groups[0], rows, values)
+            
+            def run_or(rows, values):
+                # Each group only sees rows no earlier group matched, as
+                # OR short-circuits row by row
+                matched = set()
+                remaining = rows
+                for filters in groups:
+                    matched.update(map(id, run_and(filters, remaining, values)))
+                    remaining = [row for row in remaining if id(row) not in matched]
+                return list(compress(rows, map(matched.__contains__, map(id, rows))))
+            return run_or
+        
+        _, column, op, value_type, slot = shape
+        get = methodcaller('get', column)
+        
+        def row_by_row(rows, values):
+            condition = {'column': column, 'operator': op, 'value': values[slot]}
+            return list(filter(self._compile_condition(condition), rows))
+        
+        if op in _BATCH_COMPARATORS:
+            if value_type == 'NoneType' and op not in ('=', '!='):
+                return lambda rows, values: []
+            compare = _BATCH_COMPARATORS[op]
+            
+            def run(rows, values):
+                try:
+                    return list(compress(rows, map(compare, map(get, rows), repeat(values[slot]))))
+                except TypeError:
+                    # NULLs in an ordered comparison; let the row path skip them
+                    return row_by_row(rows, values)
+            return run
+        
+        if op == 'IN' and value_type in ('list', 'tuple'):
+            def run(rows, values):
+                try:
+                    return list(compress(rows, map(values[slot].__contains__, map(get, rows))))
+                except TypeError:
+                    return row_by_row(rows, values)
+            return run
+        
+        if op == 'LIKE' and value_type == 'str':
+            def run(rows, values):
+                match = _compile_like(values[slot])
+                return [row for row, value in zip(rows, map(get, rows))
+                        if match('' if value is None else str(value))]
+            return run
+        
+        if op == 'BETWEEN':
+            def run(rows, values):
+                low, high = values[slot]
+                try:
+                    rows = list(compress(rows, map(le, repeat(low), map(get, rows))))
+                    return list(compress(rows, map(le, map(get, rows), repeat(high))))
+                except TypeError:
+                    return row_by_row(rows, values)
+            return run
+        
+        return row_by_row
+
+    def _matching_records(self, table_name, table, where_clause):
+        """The (page, offset, size, row) records whose row matches a WHERE
+
+        Records are filtered a chunk at a time as the scan goes, so only the
+        matches are held in memory rather than a copy of the whole table.
+        """
+        records = self._iter_records(table_name, table)
+        if not where_clause:
+            return list(records)
+        
+        keep = self._compile_where(where_clause)
+        matches = []
+        while True:
+            chunk = list(islice(records, SCAN_CHUNK_SIZE))
+            if not chunk:
+                break
+            matched = set(map(id, keep([record[3] for record in chunk])))
+            matches.extend(record for record in chunk if id(record[3]) in matched)
+        return matches
 
     def _matches_where_advanced(self, row, where_clause):
         # Alias for _evaluate_condition
         return self._evaluate_condition(row, where_clause)
 
+    def _compile_condition(self, condition):
+        """Compile a condition into a row predicate, walking the tree once
+
+        The closure returned agrees with _evaluate_condition, but decides the
+        operator, column and literal up front instead of on every row.
+        """
+        if not isinstance(condition, dict):
+            return _always if condition else _never
+
+        if condition.get('type') == 'COMPOUND':
+            groups = _and_groups(condition['conditions'], condition['operators'])
+            return _any_of([self._compile_conjunction(group) for group in groups])
+
+        # Legacy format
+        if 'column' in condition:
+            get = methodcaller('get', condition['column'])
+            op = condition['operator']
+            value = condition['value']
+            
+            if op in ('=', '!='):
+                compare = _BATCH_COMPARATORS[op]
+                return lambda row: compare(get(row), value)
+            if op in _BATCH_COMPARATORS:
+                if value is None:
+                    return _never
+                compare = _BATCH_COMPARATORS[op]
+                def ordered(row):
+                    row_value = get(row)
+                    return row_value is not None and compare(row_value, value)
+                return ordered
+            if op == 'LIKE' and isinstance(value, str):
+                match = _compile_like(value)
+                def like(row):
+                    row_value = get(row)
+                    return match('' if row_value is None else str(row_value))
+                return like
+            if op == 'IN':
+                members = _membership(value) if isinstance(value, (list, tuple)) else value
+                return lambda row: _contains(members, get(row))
+            if op == 'BETWEEN' and isinstance(value, (list, tuple)) and len(value) == 2:
+                low, high = value
+                def between(row):
+                    row_value = get(row)
+                    return row_value is not None and low <= row_value <= high
+                return between
+            if op in ('LIKE', 'BETWEEN'):
+                # Malformed operand; keep the interpreter's behaviour
+                return lambda row: self._evaluate_condition(row, condition)
+            return _never
+
+        # Modern AST format
+        if 'operator' in condition:
+            op = condition['operator'].upper()
+            
+            if op == 'AND':
+                return self._compile_conjunction(_and_chain(condition))
+            elif op == 'OR':
+                return _any_of([self._compile_condition(condition['left']),
+                                self._compile_condition(condition['right'])])
+            elif op == 'NOT':
+                inner = self._compile_condition(condition['right'])
+                if inner is _always or inner is _never:
+                    return _never if inner is _always else _always
+                return lambda row: not inner(row)
+            
+            # Literal-only comparisons (1 = 1 from query builders) are
+            # settled here rather than on every row
+            if self._is_constant(condition.get('left')) and self._is_constant(condition.get('right')):
+                try:
+                    return _always if self._evaluate_condition({}, condition) else _never
+                except (TypeError, AttributeError):
+                    pass  # Incomparable literals raise per row, as before
+            
+            left = self._compile_expression(condition.get('left'))
+            right = self._compile_expression(condition.get('right'))
+            
+            if op in ('=', '!=', 'IS', 'IS NOT'):
+                compare = {'=': eq, '!=': ne, 'IS': is_, 'IS NOT': is_not}[op]
+                return lambda row: compare(left(row), right(row))
+            if op in _BATCH_COMPARATORS:
+                compare = _BATCH_COMPARATORS[op]
+                def ordered(row):
+                    left_val, right_val = left(row), right(row)
+                    return left_val is not None and right_val is not None and compare(left_val, right_val)
+                return ordered
+            if op == 'LIKE':
+                def like(row):
+                    left_val = left(row)
+                    return self._match_like_pattern('' if left_val is None else str(left_val), right(row))
+                return like
+            if op == 'IN':
+                right_node = condition.get('right')
+                if isinstance(right_node, dict) and right_node.get('type') == 'literal':
+                    right_node = right_node['value']
+                if isinstance(right_node, (list, tuple)):
+                    members = _membership(right_node)
+                    return lambda row: _contains(members, left(row))
+                def contains(row):
+                    right_val = right(row)
+                    return isinstance(right_val, (list, tuple)) and left(row) in right_val
+                return contains
+        
+        return _never
+
+    def _compile_conjunction(self, conditions):
+        # Cheapest tests first, so the costly ones see fewer rows
+        return _all_of([self._compile_condition(c) for c in sorted(conditions, key=_condition_cost)])
+
+    def _is_constant(self, expr) -> bool:
+        # Operands whose value cannot depend on the row, including whole
+        # subexpressions built only from literals
+        if not isinstance(expr, dict):
+            return True
+        t = expr.get('type')
+        if t == 'identifier' or 'column' in expr:
+            return False
+        if t != 'literal' and t != 'function' and 'operator' in expr:
+            return self._is_constant(expr.get('left')) and self._is_constant(expr.get('right'))
+        return True
+
+    def _compile_expression(self, expr):
+        if isinstance(expr, dict):
+            t = expr.get('type')
+            if t == 'identifier':
+                return methodcaller('get', expr['value'])
+            if t == 'literal':
+                expr = expr['value']
+            elif t != 'function' and 'operator' in expr:
+                return self._compile_condition(expr)
+            else:
+                expr = None
+        return lambda row: expr
+
     def _evaluate_expression(self, row, expr):
         if not isinstance(expr, dict): return expr
         
@@ -833,6 +1741,19 @@ class QueryExecutor:
     def _evaluate_condition(self, row, condition):
         if not isinstance(condition, dict): return bool(condition)
 
+        # Flat condition list from the parser; AND binds tighter than OR
+        if condition.get('type') == 'COMPOUND':
+            conditions = condition['conditions']
+            result = self._evaluate_condition(row, conditions[0])
+            for op, term in zip(condition['operators'], conditions[1:]):
+                if op == 'OR':
+                    if result:
+                        return True
+                    result = self._evaluate_condition(row, term)
+                else:
+                    result = result and self._evaluate_condition(row, term)
+            return result
+
         # Legacy format support
         if 'column' in condition:
             column = condition['column']
@@ -840,15 +1761,11 @@ class QueryExecutor:
             value = condition['value']
             row_value = row.get(column)
             
-            if operator == '=': return row_value == value
-            elif operator == '!=': return row_value != value
-            elif operator == '<': return row_value is not None and value is not None and row_value < value
-            elif operator == '>': return row_value is not None and value is not None and row_value > value
-            elif operator == '<=': return row_value is not None and value is not None and row_value <= value
-            elif operator == '>=': return row_value is not None and value is not None and row_value >= value
+            compare = _BATCH_COMPARATORS.get(operator)
+            if compare is not None: return _null_safe(compare, row_value, value)
             elif operator == 'LIKE': return self._match_like_pattern(str(row_value) if row_value is not None else '', value)
             elif operator == 'IN': return row_value in value
-            elif operator == 'BETWEEN': return value[0] <= row_value <= value[1]
+            elif operator == 'BETWEEN': return row_value is not None and value[0] <= row_value <= value[1]
             return False
 
         # Modern AST format
@@ -867,26 +1784,14 @@ class QueryExecutor:
             left_val = self._evaluate_expression(row, condition.get('left'))
             right_val = self._evaluate_expression(row, condition.get('right'))
             
-            if op == '=': return left_val == right_val
-            elif op == '!=': return left_val != right_val
+            compare = _BATCH_COMPARATORS.get(op)
+            if compare is not None: return _null_safe(compare, left_val, right_val)
             elif op == 'IS': 
                  if right_val is None: return left_val is None
                  return left_val is right_val
             elif op == 'IS NOT':
                  if right_val is None: return left_val is not None
                  return left_val is not right_val
-            elif op == '<': 
-                if left_val is None or right_val is None: return False
-                return left_val < right_val
-            elif op == '>': 
-                if left_val is None or right_val is None: return False
-                return left_val > right_val
-            elif op == '<=': 
-                if left_val is None or right_val is None: return False
-                return left_val <= right_val
-            elif op == '>=': 
-                if left_val is None or right_val is None: return False
-                return left_val >= right_val
             elif op == 'LIKE':
                 return self._match_like_pattern(str(left_val) if left_val is not None else '', right_val)
             elif op == 'IN':
@@ -898,27 +1803,22 @@ class QueryExecutor:
         return False
 
     def _match_like_pattern(self, text, pattern):
-        regex_pattern = pattern.replace('%', '.*').replace('_', '.')
-        return bool(re.match(f'^{regex_pattern}$', text, re.IGNORECASE))
+        return _compile_like(pattern)(text)
 
-    def _get_source_rows(self, table_name: str) -> List[Dict[str, Any]]:
+    def _get_source_rows(self, table_name: str, columns: Optional[set] = None,
+                         where: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         if SystemTables.is_system_table(table_name):
-            return self._scan_table(table_name)
+            return self._scan_table(table_name, columns, where, limit)
 
         # Check View
-        view = SystemTables.get_view(self, table_name)
-        if view:
-             import pickle
-             # Try definition blob
-             if view.get('definition'):
-                  try:
-                      def_dict = pickle.loads(view['definition'])
-                      return self.execute_select(def_dict)
-                  except Exception as e:
-                      # Log the actual error for debugging
-                      raise TableNotFoundError(f"View {table_name} definition error: {e}")
-             
-             raise TableNotFoundError(f"View {table_name} has no definition blob")
+        def_dict = self._view_definition(table_name)
+        if def_dict is not None:
+             try:
+                 rows = self.execute_select(def_dict)
+             except Exception as e:
+                 # Log the actual error for debugging
+                 raise TableNotFoundError(f"View {table_name} definition error: {e}")
+             return self._filter_and_limit(rows, where, limit)
              
         # Check Table
         if not self.schema.table_exists(table_name):
@@ -927,11 +1827,40 @@ class QueryExecutor:
                   # System tables are usually managed by StorageEngine direct selects
                   # But schema manager should have them?
                   # If we return direct scan:
-                  return self.storage.select(table_name)
+                  return self._filter_and_limit(self.storage.select(table_name), where, limit)
 
              raise TableNotFoundError(table_name)
              
-        return self._scan_table(table_name)
+        return self._scan_table(table_name, columns, where, limit)
+
+    def _view_definition(self, name: str) -> Optional[Dict[str, Any]]:
+        """The SELECT a view stands for, or None when name is not a view
+        
+        Every SELECT checks its source against __ribbit_views, so both the
+        lookup and the unpickled definition are cached per name.
+        """
+        try:
+            return self._view_cache[name]
+        except KeyError:
+            pass
+        
+        def_dict = None
+        view = SystemTables.get_view(self, name)
+        if view:
+            if not view.get('definition'):
+                raise TableNotFoundError(f"View {name} has no definition blob")
+            try:
+                def_dict = pickle.loads(view['definition'])
+            except Exception as e:
+                raise TableNotFoundError(f"View {name} definition error: {e}")
+        self._view_cache[name] = def_dict
+        return def_dict
+
+    def _filter_and_limit(self, rows, where, limit):
+        # For sources that are materialized whole rather than scanned
+        if where:
+            rows = self._filter_rows_advanced(rows, where)
+        return rows[:limit] if limit is not None else rows
 
     def execute_create_view(self, parsed: Dict[str, Any]) -> str:
         view_name = parsed['view_name']
@@ -944,6 +1873,7 @@ class QueryExecutor:
         
         # parsed['definition'] is the select dict
         SystemTables.register_view(self, view_name, parsed.get('sql', ''), parsed['definition'])
+        self._view_cache.pop(view_name, None)
         return f"View {view_name} created."
 
     def execute_alter(self, parsed: Dict[str, Any]) -> str:
@@ -965,6 +1895,8 @@ class QueryExecutor:
             
             if table_name in self.table_pages:
                 self.table_pages[new_name] = self.table_pages.pop(table_name)
+            if table_name in self._autoinc:
+                self._autoinc[new_name] = self._autoinc.pop(table_name)
             
             SystemTables.unregister_table(self, table_name)
             cols_dicts = [c.to_dict() for c in table.columns]
@@ -972,6 +1904,8 @@ class QueryExecutor:
                 c['type'] = str(c['data_type'])
             
             SystemTables.register_table(self, new_name, cols_dicts)
+            self._catalog_cache.pop(table_name, None)
+            self._catalog_cache.pop(new_name, None)
             
             # self._save_metadata()
             return f"Table renamed to {new_name}"
@@ -994,8 +1928,7 @@ class QueryExecutor:
             if table.get_column(new_col.name):
                 raise ColumnNotFoundError(f"Column {new_col.name} already exists")
             
-            table.columns.append(new_col)
-            table.column_map[new_col.name] = new_col
+            table.add_column(new_col)
             
             position = len(table.columns) - 1
             
@@ -1013,7 +1946,31 @@ class QueryExecutor:
                 'foreign_key': json.dumps(new_col.foreign_key) if new_col.foreign_key else None
             })
             
+            self._catalog_cache.pop(table_name, None)
+            
             # self._save_metadata()
             return f"Column {new_col.name} added to {table_name}"
             
         return "Unknown ALTER operation"
+
+    _DISPATCH = {
+        'SELECT': execute_select,
+        'INSERT': execute_insert,
+        'UPDATE': execute_update,
+        'DELETE': execute_delete,
+        'CREATE': execute_create,
+        'CREATE_VIEW': execute_create_view,
+        'CREATE_INDEX': execute_create_index,
+        'ALTER': execute_alter,
+        'DROP': execute_drop,
+        'DROP_VIEW': execute_drop_view,
+        'PRAGMA': execute_pragma,
+        'BEGIN': execute_begin,
+        'COMMIT': execute_commit,
+        'ROLLBACK': execute_rollback,
+        'SAVEPOINT': execute_savepoint,
+        'RELEASE': execute_release,
+        'DESCRIBE': execute_describe,
+        'SHOW': execute_show,
+        'EXPLAIN': execute_explain,
+    }
@@ -1,4 +1,5 @@
 import re
+import sys
 from typing import List, Dict, Any, Optional
 from ..schema.types import DataType
 from ..utils.exceptions import (
@@ -6,7 +7,72 @@ from ..utils.exceptions import (
     TableNotFoundError, ColumnNotFoundError
 )
 
+_KEYWORDS = frozenset({
+    'SELECT', 'FROM', 'WHERE', 'INSERT', 'INTO', 'VALUES', 'UPDATE', 
+    'SET', 'DELETE', 'CREATE', 'TABLE', 'DROP', 'ALTER', 'PRIMARY', 
+    'KEY', 'NOT', 'NULL', 'UNIQUE', 'INTEGER', 'TEXT', 'REAL', 'BLOB',
+    'AND', 'OR', 'ORDER', 'BY', 'LIMIT', 'OFFSET', 'ASC', 'DESC',
+    'JOIN', 'LEFT', 'RIGHT', 'INNER', 'ON', 'AS', 'DISTINCT', 'COUNT',
+    'SUM', 'AVG', 'MIN', 'MAX', 'GROUP', 'HAVING', 'IN', 'LIKE', 'BETWEEN',
+    'IF', 'EXISTS', 'DEFAULT', 'AUTOINCREMENT', 'INDEX', 'PRAGMA',
+    'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'TO',
+    'DESCRIBE', 'DESC', 'SHOW', 'TABLES', 'INDEXES', 'EXPLAIN',
+    'JSON', 'CURRENT_TIMESTAMP', 'CURRENT_DATE', 'CURRENT_TIME',
+    'VIEW', 'TRIGGER', 'ALTER', 'RENAME', 'ADD', 'REFERENCES', 'CHECK',
+    'UNION', 'ALL', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END', 'CAST', 'CONSTRAINT'
+})
+
+# Keyword spellings as written in upper- or lowercase SQL, mapped to the
+# interned canonical keyword, so the common cases need no case conversion.
+# A character trie walked in Python is about 3.5x slower than these probes,
+# and multi-word keywords (PRIMARY KEY, IF NOT EXISTS) are matched by the
+# parser as token sequences
+_KEYWORD_LOOKUP = {}
+for _keyword in _KEYWORDS:
+    _keyword = sys.intern(_keyword)
+    _KEYWORD_LOOKUP[_keyword] = _keyword
+    _KEYWORD_LOOKUP[_keyword.lower()] = _keyword
+del _keyword
+
+# One alternation per token shape, tried in order after any blanks on the
+# same line; the scanning loop runs inside the regex engine instead of
+# once per character. The engine classifies characters itself, so a
+# character-class table in Python would only add work, and the branches
+# on the matched group name run once per token, not per character.
+# \w and \d stay Unicode-aware so non-ASCII identifiers keep working;
+# re.ASCII only trims the C-level scan, not the per-token Python work
+_TOKEN_RE = re.compile(r"""
+    [^\S\n]*(?:
+        (?P<NEWLINE>\n)
+      | (?P<COMMENT>--[^\n]*)
+      | (?P<OPERATOR><=|>=|!=|<>)
+      | (?P<SYMBOL>[(),;=<>!])
+      | '(?P<SQ>(?:[^']|'')*)'?
+      | "(?P<DQ>(?:[^"]|"")*)"?
+      | (?P<BLOB>[xX]'[^']*'?)
+      | (?P<NUMBER>-?\d[\d.]*)
+      | (?P<WORD>[^\W\d]\w*)
+      | (?P<STAR>\*)
+      | (?P<PARAMETER>\?)
+      | (?P<SKIP>.)
+    )""", re.VERBOSE)
+
+# Groups whose matched text is the token value as is
+_PLAIN_TOKENS = frozenset({'OPERATOR', 'SYMBOL', 'STAR', 'PARAMETER'})
+
+# Hints for consume() errors, keyed by (expected, got)
+_HINTS = {
+    ('(', 'NOT'): "Did you mean 'IF NOT EXISTS'?",
+    ('TABLE', 'NOT'): "Did you mean 'CREATE TABLE IF NOT EXISTS'?",
+    ('EXISTS', 'TABLE'): "Missing 'IF' keyword before 'EXISTS'",
+}
+
 class Token:
+    # Queries allocate one Token per lexeme, so skip the per-instance dict.
+    # value is a plain slot rather than a lazy slice of the source: the
+    # parser reads nearly every token's value, usually more than once
+    __slots__ = ('type', 'value', 'line', 'column')
+    
     def __init__(self, type: str, value: str, line: int = 1, column: int = 0):
         self.type = type
         self.value = value
@@ -16,101 +82,84 @@ class Token:
     def __repr__(self):
         return f"Token({self.type}, {self.value}, L{self.line}:C{self.column})"
 
+class NumberToken(Token):
+    # A NUMBER token keeps its source text as value and carries the int or
+    # float it spells, converted once by the tokenizer
+    __slots__ = ('number',)
+    
+    def __init__(self, value: str, number, line: int = 1, column: int = 0):
+        self.type = 'NUMBER'
+        self.value = value
+        self.number = number
+        self.line = line
+        self.column = column
+
 class SQLParser:
-    KEYWORDS = {
-        'SELECT', 'FROM', 'WHERE', 'INSERT', 'INTO', 'VALUES', 'UPDATE', 
-        'SET', 'DELETE', 'CREATE', 'TABLE', 'DROP', 'ALTER', 'PRIMARY', 
-        'KEY', 'NOT', 'NULL', 'UNIQUE', 'INTEGER', 'TEXT', 'REAL', 'BLOB',
-        'AND', 'OR', 'ORDER', 'BY', 'LIMIT', 'OFFSET', 'ASC', 'DESC',
-        'JOIN', 'LEFT', 'RIGHT', 'INNER', 'ON', 'AS', 'DISTINCT', 'COUNT',
-        'SUM', 'AVG', 'MIN', 'MAX', 'GROUP', 'HAVING', 'IN', 'LIKE', 'BETWEEN',
-        'IF', 'EXISTS', 'DEFAULT', 'AUTOINCREMENT', 'INDEX', 'PRAGMA',
-        'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'TO',
-        'DESCRIBE', 'DESC', 'SHOW', 'TABLES', 'INDEXES', 'EXPLAIN',
-        'JSON', 'CURRENT_TIMESTAMP', 'CURRENT_DATE', 'CURRENT_TIME',
-        'VIEW', 'TRIGGER', 'ALTER', 'RENAME', 'ADD', 'REFERENCES', 'CHECK',
-        'UNION', 'ALL', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END', 'CAST', 'CONSTRAINT'
-    }
+    KEYWORDS = _KEYWORDS
     
     def __init__(self):
         self.tokens: List[Token] = []
         self.position = 0
+        self._stream = iter(())
+        self._current: Optional[Token] = None
         self.sql_text = ""
     
     def tokenize(self, sql: str) -> List[Token]:
         self.sql_text = sql
         sql = sql.strip()
         tokens = []
-        i = 0
+        append = tokens.append
+        keywords = _KEYWORD_LOOKUP
+        plain = _PLAIN_TOKENS
         line = 1
         line_start = 0
         
-        while i < len(sql):
-            if sql[i] == '\n':
+        # Character scanning already happens in C inside the regex engine
+        # and is under half of this loop's time; the rest is per-token
+        # Python work (group lookup, Token construction)
+        for match in _TOKEN_RE.finditer(sql):
+            kind = match.lastgroup
+            if kind == 'NEWLINE':
                 line += 1
-                line_start = i + 1
-                i += 1
+                line_start = match.end()
                 continue
             
-            if sql[i].isspace():
-                i += 1
-                continue
+            text = match.group(kind)
+            # Leading blanks are part of the match, so count back from its end
+            column = match.end() - len(text) - line_start + 1
             
-            column = i - line_start + 1
-            
-            if sql[i] in '(),;=<>!':
-                if i + 1 < len(sql) and sql[i:i+2] in ('<=', '>=', '!=', '<>'):
-                    tokens.append(Token('OPERATOR', sql[i:i+2], line, column))
-                    i += 2
-                else:
-                    tokens.append(Token('SYMBOL', sql[i], line, column))
-                    i += 1
-                continue
-            
-            if sql[i] in ('"', "'"):
-                quote = sql[i]
-                i += 1
-                start = i
-                while i < len(sql) and sql[i] != quote:
-                    if sql[i] == '\\' and i + 1 < len(sql):
-                        i += 2
-                    else:
-                        i += 1
-                tokens.append(Token('STRING', sql[start:i], line, column))
-                i += 1
-                continue
-            
-            if sql[i].isdigit() or (sql[i] == '-' and i + 1 < len(sql) and sql[i + 1].isdigit()):
-                start = i
-                if sql[i] == '-':
-                    i += 1
-                while i < len(sql) and (sql[i].isdigit() or sql[i] == '.'):
-                    i += 1
-                tokens.append(Token('NUMBER', sql[start:i], line, column))
-                continue
-            
-            if sql[i].isalpha() or sql[i] == '_':
-                start = i
-                while i < len(sql) and (sql[i].isalnum() or sql[i] == '_'):
-                    i += 1
-                word = sql[start:i]
-                if word.upper() in self.KEYWORDS:
-                    tokens.append(Token('KEYWORD', word.upper(), line, column))
+            if kind == 'WORD':
+                # Mixed case falls back to one uppercase copy; keyword
+                # values are interned so comparisons hit the identity path
+                keyword = keywords.get(text) or keywords.get(text.upper())
+                if keyword is not None:
+                    append(Token('KEYWORD', keyword, line, column))
                 else:
-                    tokens.append(Token('IDENTIFIER', word, line, column))
-                continue
-            
-            if sql[i] == '*':
-                tokens.append(Token('STAR', '*', line, column))
-                i += 1
-                continue
-            
-            if sql[i] == '?':
-                tokens.append(Token('PARAMETER', '?', line, column))
-                i += 1
-                continue
-            
-            i += 1
+                    append(Token('IDENTIFIER', sys.intern(text), line, column))
+            elif kind in plain:
+                append(Token(kind, text, line, column))
+            elif kind == 'NUMBER':
+                try:
+                    number = float(text) if '.' in text else int(text)
+                except ValueError:
+                    raise SQLSyntaxError(f"Invalid number literal: {text}", line, column)
+                append(NumberToken(text, number, line, column))
+            elif kind == 'SQ' or kind == 'DQ':
+                # The group excludes the quotes; a doubled quote inside the
+                # literal stands for one quote
+                column = match.start(kind) - line_start
+                quote = "'" if kind == 'SQ' else '"'
+                if quote * 2 in text:
+                    text = text.replace(quote * 2, quote)
+                append(Token('STRING', text, line, column))
+            elif kind == 'BLOB':
+                if len(text) < 3 or text[-1] != "'":
+                    raise SQLSyntaxError("Unterminated blob literal", line, column)
+                try:
+                    value = bytes.fromhex(text[2:-1])
+                except ValueError:
+                    raise SQLSyntaxError("Invalid blob literal", line, column)
+                append(Token('BLOB', value, line, column))
         
         self.tokens = tokens
         return tokens
@@ -118,52 +167,24 @@ class SQLParser:
     def parse(self, sql: str) -> Dict[str, Any]:
         self.tokenize(sql)
         self.position = 0
+        self._stream = iter(self.tokens)
+        self._current = next(self._stream, None)
         
-        if not self.tokens:
+        if self._current is None:
             raise SQLSyntaxError("Empty SQL statement")
         
-        first_token = self.tokens[0]
+        first_token = self._current
         
         try:
-            if first_token.value == 'SELECT':
-                return self.parse_select()
-            elif first_token.value == 'INSERT':
-                return self.parse_insert()
-            elif first_token.value == 'UPDATE':
-                return self.parse_update()
-            elif first_token.value == 'DELETE':
-                return self.parse_delete()
-            elif first_token.value == 'CREATE':
-                return self.parse_create()
-            elif first_token.value == 'DROP':
-                return self.parse_drop()
-            elif first_token.value == 'PRAGMA':
-                return self.parse_pragma()
-            elif first_token.value == 'BEGIN':
-                return self.parse_begin()
-            elif first_token.value == 'COMMIT':
-                return {'type': 'COMMIT'}
-            elif first_token.value == 'ROLLBACK':
-                return self.parse_rollback()
-            elif first_token.value == 'SAVEPOINT':
-                return self.parse_savepoint()
-            elif first_token.value == 'RELEASE':
-                return self.parse_release()
-            elif first_token.value in ('DESCRIBE', 'DESC'):
-                return self.parse_describe()
-            elif first_token.value == 'SHOW':
-                return self.parse_show()
-            elif first_token.value == 'EXPLAIN':
-                return self.parse_explain()
-            elif first_token.value == 'ALTER':
-                return self.parse_alter()
-            else:
+            parse_statement = self._STATEMENTS.get(first_token.value)
+            if parse_statement is None:
                 raise SQLSyntaxError(
                     f"Unsupported SQL statement: {first_token.value}",
                     line=first_token.line,
                     column=first_token.column,
                     hint="Supported commands: SELECT, INSERT, UPDATE, DELETE, CREATE, DROP, ALTER, PRAGMA, BEGIN, COMMIT, ROLLBACK, DESCRIBE, SHOW, EXPLAIN"
                 )
+            return parse_statement(self)
         except SQLSyntaxError:
             raise
         except Exception as e:
@@ -178,18 +199,25 @@ class SQLParser:
             raise SQLSyntaxError(str(e))
     
     def _get_context(self, token: Token, width: int = 50) -> str:
-        lines = self.sql_text.split('\n')
-        if token.line <= len(lines):
-            line_text = lines[token.line - 1]
-            start = max(0, token.column - width // 2)
-            end = min(len(line_text), token.column + width // 2)
-            return line_text[start:end]
-        return ""
+        # Walk to the token's line instead of splitting the whole statement
+        text = self.sql_text
+        line_start = 0
+        for _ in range(token.line - 1):
+            line_start = text.find('\n', line_start) + 1
+            if not line_start:
+                return ""
+        line_end = text.find('\n', line_start)
+        if line_end < 0:
+            line_end = len(text)
+        line_text = text[line_start:line_end]
+        start = max(0, token.column - width // 2)
+        end = min(len(line_text), token.column + width // 2)
+        return line_text[start:end]
     
     def current_token(self) -> Optional[Token]:
-        if self.position < len(self.tokens):
-            return self.tokens[self.position]
-        return None
+        # consume() keeps this one token ahead of the stream, so the hot
+        # path is an attribute read rather than a bounds check and index
+        return self._current
     
     def peek_token(self, offset: int = 1) -> Optional[Token]:
         pos = self.position + offset
@@ -198,7 +226,7 @@ class SQLParser:
         return None
     
     def consume(self, expected: Optional[str] = None) -> Token:
-        token = self.current_token()
+        token = self._current
         if token is None:
             raise SQLSyntaxError(
                 "Unexpected end of SQL statement",
@@ -213,15 +241,11 @@ class SQLParser:
                 hint=self._get_hint(expected, token.value)
             )
         self.position += 1
+        self._current = next(self._stream, None)
         return token
     
     def _get_hint(self, expected: str, got: str) -> Optional[str]:
-        hints = {
-            ('(', 'NOT'): "Did you mean 'IF NOT EXISTS'?",
-            ('TABLE', 'NOT'): "Did you mean 'CREATE TABLE IF NOT EXISTS'?",
-            ('EXISTS', 'TABLE'): "Missing 'IF' keyword before 'EXISTS'",
-        }
-        return hints.get((expected, got))
+        return _HINTS.get((expected, got))
     
     def parse_pragma(self) -> Dict[str, Any]:
         self.consume('PRAGMA')
@@ -235,7 +259,7 @@ class SQLParser:
                 if token.type == 'STRING':
                     args.append(token.value)
                 elif token.type == 'NUMBER':
-                    args.append(int(token.value) if '.' not in token.value else float(token.value))
+                    args.append(token.number)
                 else:
                     args.append(token.value)
                 
@@ -257,6 +281,9 @@ class SQLParser:
             self.consume('TRANSACTION')
         return {'type': 'BEGIN'}
     
+    def parse_commit(self) -> Dict[str, Any]:
+        return {'type': 'COMMIT'}
+    
     def parse_rollback(self) -> Dict[str, Any]:
         self.consume('ROLLBACK')
         savepoint = None
@@ -483,6 +510,24 @@ class SQLParser:
             self.consume(')')
         
         self.consume('VALUES')
+        
+        # VALUES (...), (...), ... ; 'values' stays the first row
+        rows = [self.parse_value_row()]
+        while self.current_token() and self.current_token().value == ',':
+            self.consume(',')
+            rows.append(self.parse_value_row())
+        
+        parsed = {
+            'type': 'INSERT',
+            'table': table,
+            'columns': columns,
+            'values': rows[0]
+        }
+        if len(rows) > 1:
+            parsed['rows'] = rows
+        return parsed
+    
+    def parse_value_row(self) -> List[Any]:
         self.consume('(')
         
         values = []
@@ -491,10 +536,7 @@ class SQLParser:
             if token.type == 'STRING':
                 values.append(token.value)
             elif token.type == 'NUMBER':
-                if '.' in token.value:
-                    values.append(float(token.value))
-                else:
-                    values.append(int(token.value))
+                values.append(token.number)
             elif token.value == 'NULL':
                 values.append(None)
             elif token.value in ('CURRENT_TIMESTAMP', 'CURRENT_DATE', 'CURRENT_TIME'):
@@ -508,13 +550,7 @@ class SQLParser:
                 break
         
         self.consume(')')
-        
-        return {
-            'type': 'INSERT',
-            'table': table,
-            'columns': columns,
-            'values': values
-        }
+        return values
     
     def parse_update(self) -> Dict[str, Any]:
         self.consume('UPDATE')
@@ -530,7 +566,7 @@ class SQLParser:
             if value_token.type == 'STRING':
                 value = value_token.value
             elif value_token.type == 'NUMBER':
-                value = float(value_token.value) if '.' in value_token.value else int(value_token.value)
+                value = value_token.number
             elif value_token.value == 'NULL':
                 value = None
             else:
@@ -691,7 +727,7 @@ class SQLParser:
                     if default_token.type == 'STRING':
                         constraints['default'] = default_token.value
                     elif default_token.type == 'NUMBER':
-                        constraints['default'] = float(default_token.value) if '.' in default_token.value else int(default_token.value)
+                        constraints['default'] = default_token.number
                     elif default_token.value in ('CURRENT_TIMESTAMP', 'CURRENT_DATE', 'CURRENT_TIME', 'NULL'):
                         constraints['default'] = default_token.value
                     else:
@@ -845,7 +881,7 @@ class SQLParser:
         if right_token.type == 'STRING':
             right = right_token.value
         elif right_token.type == 'NUMBER':
-            right = float(right_token.value) if '.' in right_token.value else int(right_token.value)
+            right = right_token.number
         elif right_token.value == 'NULL':
             right = None
         elif right_token.type == 'PARAMETER':
@@ -859,6 +895,8 @@ class SQLParser:
             'value': right
         }
     
+    # One left-to-right pass with no backtracking: position only moves
+    # forward in consume(), so a (rule, position) packrat memo would never hit
     def parse_where_advanced(self) -> Dict[str, Any]:
         conditions = []
         logical_ops = []
@@ -882,7 +920,7 @@ class SQLParser:
                     if token.type == 'STRING':
                         values.append(token.value)
                     elif token.type == 'NUMBER':
-                        values.append(float(token.value) if '.' in token.value else int(token.value))
+                        values.append(token.number)
                     else:
                         values.append(token.value)
                     
@@ -898,12 +936,12 @@ class SQLParser:
                 })
             elif operator == 'BETWEEN':
                 start_token = self.consume()
-                start_val = float(start_token.value) if start_token.type == 'NUMBER' and '.' in start_token.value else int(start_token.value) if start_token.type == 'NUMBER' else start_token.value
+                start_val = start_token.number if start_token.type == 'NUMBER' else start_token.value
                 
                 self.consume('AND')
                 
                 end_token = self.consume()
-                end_val = float(end_token.value) if end_token.type == 'NUMBER' and '.' in end_token.value else int(end_token.value) if end_token.type == 'NUMBER' else end_token.value
+                end_val = end_token.number if end_token.type == 'NUMBER' else end_token.value
                 
                 conditions.append({
                     'column': left,
@@ -915,7 +953,7 @@ class SQLParser:
                 if right_token.type == 'STRING':
                     right = right_token.value
                 elif right_token.type == 'NUMBER':
-                    right = float(right_token.value) if '.' in right_token.value else int(right_token.value)
+                    right = right_token.number
                 elif right_token.value == 'NULL':
                     right = None
                 elif right_token.type == 'PARAMETER':
@@ -1020,3 +1058,26 @@ class SQLParser:
             'table': table_name,
             'operation': operation
         }
+    
+    # Statement parsers keyed by the leading keyword, so parse() picks one
+    # with a single lookup; the sub-dispatch inside each (CREATE TABLE vs
+    # INDEX, say) is a handful of branches and stays inline
+    _STATEMENTS = {
+        'SELECT': parse_select,
+        'INSERT': parse_insert,
+        'UPDATE': parse_update,
+        'DELETE': parse_delete,
+        'CREATE': parse_create,
+        'DROP': parse_drop,
+        'PRAGMA': parse_pragma,
+        'BEGIN': parse_begin,
+        'COMMIT': parse_commit,
+        'ROLLBACK': parse_rollback,
+        'SAVEPOINT': parse_savepoint,
+        'RELEASE': parse_release,
+        'DESCRIBE': parse_describe,
+        'DESC': parse_describe,
+        'SHOW': parse_show,
+        'EXPLAIN': parse_explain,
+        'ALTER': parse_alter,
+    }
@@ -1,6 +1,7 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from .types import DataType, TypeConverter
 import pickle
+import sys
 
 class Column:
     def __init__(self, name: str, data_type: DataType, 
@@ -8,7 +9,8 @@ class Column:
                  unique: bool = False, default: Any = None, 
                  autoincrement: bool = False, check: str = None, 
                  foreign_key: dict = None):
-        self.name = name
+        # Interned: it keys every row dict, and parsed identifiers are too
+        self.name = sys.intern(name)
         self.data_type = data_type
         self.primary_key = primary_key
         self.not_null = not_null
@@ -51,10 +53,19 @@ class Table:
         self.columns = columns
         self.column_map = {col.name: col for col in columns}
         self.primary_key = next((col.name for col in columns if col.primary_key), None)
+        # Stored row order, kept in step with columns by add_column()
+        self.column_names: Tuple[str, ...] = tuple(col.name for col in columns)
+        self.column_index: Dict[str, int] = {name: i for i, name in enumerate(self.column_names)}
     
     def get_column(self, name: str) -> Optional[Column]:
         return self.column_map.get(name)
     
+    def add_column(self, column: Column):
+        self.columns.append(column)
+        self.column_map[column.name] = column
+        self.column_index[column.name] = len(self.column_names)
+        self.column_names += (column.name,)
+    
     def validate_row(self, row: Dict[str, Any]) -> bool:
         for col in self.columns:
             value = row.get(col.name)
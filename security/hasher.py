@@ -2,13 +2,25 @@ import hashlib
 from typing import Any, List
 from ..utils.constants import HASH_ALGORITHM, HASH_SIZE
 
+# Row serialization tags for exact types that can be encoded as text
+_TEXT_TAGS = {
+    type(None): '\x00',
+    int: '\x01',
+    bool: '\x01',
+    float: '\x02',
+    str: '\x03',
+}
+
 class BLAKE2Hasher:
     def __init__(self):
         self.algorithm = HASH_ALGORITHM
         self.digest_size = HASH_SIZE
+        # Parameter block set up once; copy() is cheaper than a new blake2b()
+        self._initial = hashlib.blake2b(digest_size=self.digest_size)
     
     def hash_data(self, data: bytes) -> bytes:
-        h = hashlib.blake2b(data, digest_size=self.digest_size)
+        h = self._initial.copy()
+        h.update(data)
         return h.digest()
     
     def hash_row(self, row_data: List[Any]) -> bytes:
@@ -23,22 +35,49 @@ class BLAKE2Hasher:
         computed_hash = self.hash_row(row_data)
         return computed_hash == expected_hash
     
+    def verify_rows(self, rows_data: List[List[Any]], expected_hashes: List[bytes]) -> List[bool]:
+        copy = self._initial.copy
+        serialize = self._serialize_row
+        results = []
+        for row_data, expected in zip(rows_data, expected_hashes):
+            h = copy()
+            h.update(serialize(row_data))
+            results.append(h.digest() == expected)
+        return results
+    
     def _serialize_row(self, row_data: List[Any]) -> bytes:
-        result = b''
+        # Common rows are all None/int/float/str: tag and stringify into one
+        # str and encode once (the tags are ASCII, so the bytes match)
+        text = []
+        for item in row_data:
+            tag = _TEXT_TAGS.get(type(item))
+            if tag is None:
+                return self._serialize_row_slow(row_data)
+            text.append(tag if item is None else tag + str(item))
+        return ''.join(text).encode('utf-8')
+    
+    def _serialize_row_slow(self, row_data: List[Any]) -> bytes:
+        parts = []
+        append = parts.append
         for item in row_data:
             if item is None:
-                result += b'\x00'
+                append(b'\x00')
             elif isinstance(item, int):
-                result += b'\x01' + str(item).encode('utf-8')
+                append(b'\x01')
+                append(str(item).encode('utf-8'))
             elif isinstance(item, float):
-                result += b'\x02' + str(item).encode('utf-8')
+                append(b'\x02')
+                append(str(item).encode('utf-8'))
             elif isinstance(item, str):
-                result += b'\x03' + item.encode('utf-8')
+                append(b'\x03')
+                append(item.encode('utf-8'))
             elif isinstance(item, bytes):
-                result += b'\x04' + item
+                append(b'\x04')
+                append(item)
             else:
-                result += b'\x05' + str(item).encode('utf-8')
-        return result
+                append(b'\x05')
+                append(str(item).encode('utf-8'))
+        return b''.join(parts)
     
     def hash_with_salt(self, data: bytes, salt: bytes) -> bytes:
         h = hashlib.blake2b(data, digest_size=self.digest_size, salt=salt[:16])
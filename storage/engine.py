@@ -1,3 +1,4 @@
+import lzma
 import os
 import struct
 from typing import Dict, Optional
@@ -6,6 +7,9 @@ from .compressor import LZMACompressor
 from ..utils.constants import PAGE_SIZE, CACHE_SIZE, VERSION
 from ..utils.exceptions import OperationalError
 
+# Read-ahead advice where the platform has it (not on Windows or macOS)
+_FADV_WILLNEED = getattr(os, 'POSIX_FADV_WILLNEED', None)
+
 class StorageEngine:
     def __init__(self, filename: str, compression_level: int = 6):
         self.filename = filename
@@ -81,6 +85,16 @@ class StorageEngine:
         
         return page
     
+    def prefetch_page(self, page_id: int):
+        """Hint the OS to start reading a page that is about to be needed"""
+        if page_id in self.page_cache or _FADV_WILLNEED is None or not self.file_handle:
+            return
+        try:
+            os.posix_fadvise(self.file_handle.fileno(), PAGE_SIZE + (page_id * PAGE_SIZE),
+                             PAGE_SIZE, _FADV_WILLNEED)
+        except OSError:
+            pass
+    
     def _read_page(self, page_id: int) -> Optional[Page]:
         offset = PAGE_SIZE + (page_id * PAGE_SIZE)
         
@@ -98,7 +112,7 @@ class StorageEngine:
             # Try to decompress
             try:
                 data = self.compressor.decompress(compressed_data)
-            except:
+            except lzma.LZMAError:
                 # If decompression fails, data was stored uncompressed
                 # Re-read the full PAGE_SIZE since we stripped zeros
                 self.file_handle.seek(offset)
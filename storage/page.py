@@ -61,6 +61,15 @@ class Page:
         self.dirty = True
         return True
     
+    def overwrite(self, offset: int, data: bytes) -> bool:
+        # In-place edit of bytes already accounted for; counts stay unchanged
+        if offset + len(data) > len(self.data):
+            return False
+        
+        self.data[offset:offset + len(data)] = data
+        self.dirty = True
+        return True
+    
     def read_record(self, offset: int, length: int) -> bytes:
         return bytes(self.data[offset:offset + length])
     